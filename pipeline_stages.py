@@ -0,0 +1,82 @@
+"""
+Stage runner shared by run_cron_pipeline.py and run_scraper_pipeline.py.
+
+Stages with an entry point are imported and called in-process, under
+their own logging setup. The network-bound stages (1 and 3) have none:
+they run as python3 subprocesses so a hung fetch is cut off by the
+stage's time limit.
+"""
+
+import importlib.util
+import logging
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent / "scripts"
+
+# Stages import shared helpers (fs_walk) from their own directory
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+def load_stage(script_name):
+    """Import a stage script by file name (names start with a digit, so no plain import)."""
+    spec = importlib.util.spec_from_file_location(Path(script_name).stem, SCRIPTS_DIR / script_name)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _call_stage(script_name, entry_point):
+    """
+    Call a stage's entry point with the stage's own log handlers installed.
+    
+    The runner's root handlers are set aside first so the stage's
+    setup_logging() (a basicConfig call) takes effect, and are restored
+    afterwards.
+    """
+    stage = load_stage(script_name)
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    root.handlers.clear()
+    try:
+        stage.setup_logging()
+        getattr(stage, entry_point)()
+    finally:
+        for handler in root.handlers:
+            handler.close()
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
+
+
+def run_stage(stage_num, script_name, entry_point=None, timeout=None):
+    """
+    Run a single stage: in-process via entry_point, or, without one, as a
+    python3 subprocess limited to timeout seconds.
+    """
+    logging.info(f"\n{'='*70}")
+    logging.info(f"Running Stage {stage_num}: {script_name}")
+    logging.info(f"{'='*70}\n")
+    
+    try:
+        if entry_point is not None:
+            _call_stage(script_name, entry_point)
+            return True
+        
+        result = subprocess.run(
+            ["python3", f"scripts/{script_name}"],
+            timeout=timeout
+        )
+        
+        if result.returncode != 0:
+            logging.error(f"Stage {stage_num} failed with exit code {result.returncode}")
+            return False
+        
+        return True
+    
+    except subprocess.TimeoutExpired:
+        logging.error(f"Stage {stage_num} timed out after {timeout//60} minutes")
+        return False
+    except Exception as e:
+        logging.error(f"Stage {stage_num} error: {e}")
+        return False
@@ -9,47 +9,23 @@ Runs the first three stages of the pipeline:
 
 This is optimized for hourly cron execution.
 Stage 4 (generating API) is run separately.
+
+Stage 2 runs in-process (no interpreter start-up); the fetch and
+download stages run as subprocesses with per-stage time limits, and
+config/cron_wrapper.sh bounds the whole run.
 """
 
-import subprocess
 import sys
 import logging
 
+from pipeline_stages import run_stage
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s",
 )
 
-def run_stage(stage_num, script_name):
-    """Run a single stage script."""
-    logging.info(f"\n{'='*70}")
-    logging.info(f"Running Stage {stage_num}: {script_name}")
-    logging.info(f"{'='*70}\n")
-    
-    try:
-        # Stage 3 needs more time for downloading
-        timeout = 1800 if stage_num == 3 else 600  # 30 min for Stage 3, 10 min for others
-        
-        result = subprocess.run(
-            ["python3", f"scripts/{script_name}"],
-            timeout=timeout
-        )
-        
-        if result.returncode != 0:
-            logging.error(f"Stage {stage_num} failed with exit code {result.returncode}")
-            return False
-        
-        return True
-    
-    except subprocess.TimeoutExpired:
-        logging.error(f"Stage {stage_num} timed out after {timeout//60} minutes")
-        return False
-    except Exception as e:
-        logging.error(f"Stage {stage_num} error: {e}")
-        return False
-
-
 def main():
     """Run cron pipeline (stages 1-3)."""
     
@@ -58,15 +34,16 @@ def main():
     logging.info("="*70)
     
     stages = [
-        (1, "1_fetch_main_page.py"),
-        (2, "2_parse_html_to_json.py"),
-        (3, "3_download_job_pages.py"),
+        # Stages 1 and 3 run as subprocesses; stage 3 needs more time for downloading
+        (1, "1_fetch_main_page.py", None, 600),
+        (2, "2_parse_html_to_json.py", "main", None),
+        (3, "3_download_job_pages.py", None, 1800),
     ]
     
     failed_stages = []
     
-    for stage_num, script_name in stages:
-        if not run_stage(stage_num, script_name):
+    for stage_num, script_name, entry_point, timeout in stages:
+        if not run_stage(stage_num, script_name, entry_point, timeout):
             failed_stages.append((stage_num, script_name))
             # Continue to next stage even if this one fails
     
@@ -7,44 +7,24 @@ Runs all 4 stages in order:
   2. Parse HTML to JSON
   3. Download individual job pages
   4. Generate dashboard API
+
+Stages 2 and 4 run in-process, so they are imported once instead of
+paying interpreter start-up in a separate python3 process. The fetch and
+download stages run as subprocesses with a 15 minute time limit each.
 """
 
 import subprocess
 import sys
 import logging
 
+from pipeline_stages import run_stage
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s",
 )
 
-def run_stage(stage_num, script_name):
-    """Run a single stage script."""
-    logging.info(f"\n{'='*70}")
-    logging.info(f"Running Stage {stage_num}: {script_name}")
-    logging.info(f"{'='*70}\n")
-    
-    try:
-        result = subprocess.run(
-            ["python3", f"scripts/{script_name}"],
-            timeout=900  # 15 minute timeout per stage
-        )
-        
-        if result.returncode != 0:
-            logging.error(f"Stage {stage_num} failed with exit code {result.returncode}")
-            return False
-        
-        return True
-    
-    except subprocess.TimeoutExpired:
-        logging.error(f"Stage {stage_num} timed out after 15 minutes")
-        return False
-    except Exception as e:
-        logging.error(f"Stage {stage_num} error: {e}")
-        return False
-
-
 def main():
     """Run all stages of the pipeline."""
     
@@ -53,16 +33,17 @@ def main():
     logging.info("="*70)
     
     stages = [
-        (1, "1_fetch_main_page.py"),
-        (2, "2_parse_html_to_json.py"),
-        (3, "3_download_job_pages.py"),
-        (4, "4_generate_dashboard_api.py")
+        # Network-bound stages run as subprocesses, 15 minute timeout each
+        (1, "1_fetch_main_page.py", None, 900),
+        (2, "2_parse_html_to_json.py", "main", None),
+        (3, "3_download_job_pages.py", None, 900),
+        (4, "4_generate_dashboard_api.py", "main", None)
     ]
     
     failed_stages = []
     
-    for stage_num, script_name in stages:
-        if not run_stage(stage_num, script_name):
+    for stage_num, script_name, entry_point, timeout in stages:
+        if not run_stage(stage_num, script_name, entry_point, timeout):
             failed_stages.append((stage_num, script_name))
             # Continue to next stage even if this one fails
     
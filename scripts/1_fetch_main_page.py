@@ -11,54 +11,94 @@ Caching: If a file was downloaded within 1 hour, uses cache instead of re-downlo
 import time
 import os
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from playwright.sync_api import sync_playwright
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("debug.log"),
-        logging.StreamHandler()
-    ]
-)
+
+def setup_logging():
+    """Log to debug.log and the console at DEBUG level."""
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[
+            logging.FileHandler("debug.log"),
+            logging.StreamHandler()
+        ]
+    )
+
+
+# Job cards on the listing page, and the condition that ends a load-more round:
+# either new cards were appended or the button was marked done
+POST_SELECTOR = "div[id^='post-']"
+LOAD_MORE_DONE_JS = """
+prev => {
+    const button = document.querySelector('#load-more');
+    return (button && button.classList.contains('done'))
+        || document.querySelectorAll("div[id^='post-']").length > prev;
+}
+"""
+
+# Resource types never needed to read the listing HTML
+BLOCKED_RESOURCE_TYPES = {'image', 'font', 'media', 'stylesheet'}
+
+
+def _block_heavy_resources(route):
+    """Abort requests for assets that only affect rendering."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+# Persistent Chromium profile: keeps HTTP/DNS caches warm between cron runs
+PROFILE_DIR = os.path.join('.cache', 'pw-profile')
+
+
+def _day_dirs(start_ts, end_ts):
+    """Yield the data/YYYY/MM/DD directories covering the [start_ts, end_ts] window."""
+    day = datetime.fromtimestamp(start_ts).date()
+    last = datetime.fromtimestamp(end_ts).date()
+    while day <= last:
+        yield os.path.join('data', day.strftime('%Y'), day.strftime('%m'), day.strftime('%d'))
+        day += timedelta(days=1)
+
 
 def check_cache(cache_hours=1):
     """
     Check if a recent HTML file exists within cache window.
     
+    Only the day directories the window can touch are scanned, with one
+    stat per candidate file, instead of walking the whole data/ tree.
+    
     Args:
         cache_hours: Hours threshold for cache validity (default: 1)
     
     Returns:
         Path to cached file if valid, None otherwise
     """
-    base_path = Path('data')
-    
-    if not base_path.exists():
-        return None
-    
-    # Find all output_*.html files
-    html_files = list(base_path.rglob('output_*.html'))
+    now = time.time()
+    cutoff = now - cache_hours * 3600
     
-    if not html_files:
-        return None
+    latest_path = None
+    latest_mtime = cutoff
     
-    # Sort by modification time and check the latest
-    html_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
-    latest_file = html_files[0]
-    
-    # Check if file is within cache window
-    current_time = time.time()
-    file_mtime = latest_file.stat().st_mtime
-    age_hours = (current_time - file_mtime) / 3600
-    
-    if age_hours < cache_hours:
-        return latest_file
+    for day_dir in _day_dirs(cutoff, now):
+        try:
+            entries = os.scandir(day_dir)
+        except FileNotFoundError:
+            continue
+        
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if not (name.startswith('output_') and name.endswith('.html')):
+                    continue
+                mtime = entry.stat().st_mtime
+                if mtime > latest_mtime:
+                    latest_path, latest_mtime = entry.path, mtime
     
-    return None
+    return Path(latest_path) if latest_path else None
 
 def fetch_main_page():
     """Fetch the main jobs listing page using Playwright, with 1-hour cache."""
@@ -81,9 +121,9 @@ def fetch_main_page():
     # Start Playwright
     with sync_playwright() as p:
         logging.debug("Launching browser...")
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context()
-        page = context.new_page()
+        context = p.chromium.launch_persistent_context(user_data_dir=PROFILE_DIR, headless=True)
+        context.route("**/*", _block_heavy_resources)
+        page = context.pages[0] if context.pages else context.new_page()
 
         # Navigate to the target URL
         url = "https://lobbyx.army/?sphere=it"
@@ -111,8 +151,10 @@ def fetch_main_page():
                     break
                 
                 logging.debug(f"Clicking load-more button (attempt {attempt})...")
+                prev_count = page.locator(POST_SELECTOR).count()
                 load_more_button.click()
-                page.wait_for_timeout(2000)  # Wait for AJAX requests to complete
+                # Wait for the AJAX batch to land instead of a fixed sleep
+                page.wait_for_function(LOAD_MORE_DONE_JS, arg=prev_count, timeout=10000)
                 
             except Exception as e:
                 logging.debug(f"No more load-more button or error: {e}")
@@ -122,22 +164,21 @@ def fetch_main_page():
             logging.warning(f"Reached maximum attempts ({max_attempts}), stopping load-more clicks")
 
         # Create a three-level directory structure for data files
-        subfolder1 = time.strftime("%Y")
-        subfolder2 = time.strftime("%m")
-        subfolder3 = time.strftime("%d")
-        output_dir = os.path.join("data", subfolder1, subfolder2, subfolder3)
+        now = time.localtime()
+        output_dir = os.path.join("data", time.strftime("%Y", now), time.strftime("%m", now), time.strftime("%d", now))
         os.makedirs(output_dir, exist_ok=True)
 
         # Save the page content to an HTML file with a timestamp
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime("%Y%m%d_%H%M%S", now)
         html_file = os.path.join(output_dir, f"output_{timestamp}.html")
         with open(html_file, "w", encoding="utf-8") as f:
             f.write(page.content())
         
         logging.info(f"✓ Page saved to {html_file}")
-        browser.close()
+        context.close()
         logging.debug("Browser closed")
 
 if __name__ == "__main__":
+    setup_logging()
     fetch_main_page()
     logging.info("STAGE 1 Complete\n")
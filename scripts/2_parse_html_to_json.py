@@ -15,6 +15,21 @@ from pathlib import Path
 from bs4 import BeautifulSoup
 from datetime import datetime
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+try:
+    import lxml  # noqa: F401 - C-backed tree builder for BeautifulSoup
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+# BeautifulSoup tree builder: lxml is several times faster than html.parser
+BS4_PARSER = 'lxml' if HAS_LXML else 'html.parser'
+
 def log_cron_stats(parsed_count):
     """Log parsing statistics to cron stats file."""
     stats_file = Path("logs/cron_stats.jsonl")
@@ -25,27 +40,69 @@ def log_cron_stats(parsed_count):
         "parsed_jobs": parsed_count,
     }
     
+    # One write() on an O_APPEND fd is atomic for lines this short (< PIPE_BUF),
+    # so concurrent runs never interleave their records
+    line = (json.dumps(stats, ensure_ascii=False) + "\n").encode("utf-8")
     try:
-        with open(stats_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(stats, ensure_ascii=False) + "\n")
+        fd = os.open(stats_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
         logging.debug(f"Logged cron stats: {parsed_count} jobs parsed")
     except Exception as e:
         logging.error(f"Failed to write cron stats: {e}")
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("debug.log"),
-        logging.StreamHandler()
-    ]
-)
+
+def setup_logging():
+    """Configure DEBUG logging to debug.log and the console."""
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[
+            logging.FileHandler("debug.log"),
+            logging.StreamHandler()
+        ]
+    )
+
+
+# id attribute of a job post div on the listing page
+_POST_DIV_ID_RE = re.compile(r'^post-\d+$')
+_NONDIGIT = str.maketrans('', '', '0123456789')
+
 
 def extract_post_id(post_id_str):
     """Extract numeric ID from post-XXXXX format."""
-    match = re.search(r'post-(\d+)', post_id_str)
-    return match.group(1) if match else None
+    if not isinstance(post_id_str, str):
+        raise TypeError(f"expected str, got {type(post_id_str).__name__}")
+    if post_id_str.startswith('post-'):
+        digits = post_id_str[5:]
+        if digits and not digits.translate(_NONDIGIT):
+            return digits
+    return None
+
+
+def classify_post_classes(classes):
+    """
+    Split a post div's classes into (categories, units, status) in one pass.
+    
+    status comes from the last tors-status-* class: 'open', 'closed', or
+    'unknown' when none says either.
+    """
+    categories = []
+    units = []
+    status = 'unknown'
+    for cls in classes:
+        if cls.startswith('category-'):
+            categories.append(cls)
+        elif cls.startswith('units-'):
+            units.append(cls)
+        if 'tors-status-' in cls:
+            if 'is-open' in cls:
+                status = 'open'
+            elif 'is-closed' in cls:
+                status = 'closed'
+    return categories, units, status
 
 
 def parse_post_div(post_div):
@@ -63,34 +120,29 @@ def parse_post_div(post_div):
     """
     post_id = extract_post_id(post_div.get('id', ''))
     
-    # Get all classes to extract categories
-    classes = post_div.get('class', [])
-    categories = [cls for cls in classes if cls.startswith('category-')]
-    units = [cls for cls in classes if cls.startswith('units-')]
-    status_classes = [cls for cls in classes if 'tors-status-' in cls]
+    # Get categories, units and status from the class list
+    categories, units, status = classify_post_classes(post_div.get('class', []))
     
-    # Extract status
-    status = 'unknown'
-    for status_class in status_classes:
-        if 'is-open' in status_class:
-            status = 'open'
-        elif 'is-closed' in status_class:
-            status = 'closed'
-    
-    # Find the link
-    link = post_div.find('a', class_='job-item')
-    url = link.get('href', '') if link else ''
+    # Find the link, unit name, position and image in one walk of the post
+    # (first match of each, as separate find() calls would return)
+    link = unit_name_elem = position_elem = img_elem = None
+    for elem in post_div.find_all(('a', 'h4', 'img')):
+        elem_classes = elem.get('class', [])
+        if elem.name == 'a':
+            if link is None and 'job-item' in elem_classes:
+                link = elem
+        elif elem.name == 'img':
+            if img_elem is None and 'wp-post-image' in elem_classes:
+                img_elem = elem
+        else:
+            if unit_name_elem is None and 'square-content__title' in elem_classes:
+                unit_name_elem = elem
+            if position_elem is None and 'vacancy_content' in elem_classes:
+                position_elem = elem
     
-    # Find unit name
-    unit_name_elem = post_div.find('h4', class_='square-content__title')
+    url = link.get('href', '') if link else ''
     unit_name = unit_name_elem.get_text(strip=True) if unit_name_elem else ''
-    
-    # Find position/vacancy
-    position_elem = post_div.find('h4', class_='vacancy_content')
     position = position_elem.get_text(strip=True) if position_elem else ''
-    
-    # Find image
-    img_elem = post_div.find('img', class_='wp-post-image')
     image_url = img_elem.get('src', '') if img_elem else ''
     
     return {
@@ -105,21 +157,71 @@ def parse_post_div(post_div):
     }
 
 
+def _node_text(node):
+    """Stripped text of a lexbor node, or '' when the node is missing."""
+    return node.text(strip=True) if node is not None else ''
+
+
+def _node_attr(node, name):
+    """Attribute value of a lexbor node, or '' when missing or valueless."""
+    if node is None:
+        return ''
+    return node.attributes.get(name) or ''
+
+
+def parse_post_node(post_node):
+    """
+    Extract data from a post div parsed by lexbor.
+    
+    Same fields and rules as parse_post_div, using CSS selectors on the
+    selectolax tree instead of BeautifulSoup lookups.
+    """
+    post_id = extract_post_id(_node_attr(post_node, 'id'))
+    
+    categories, units, status = classify_post_classes(_node_attr(post_node, 'class').split())
+    
+    return {
+        'post_id': post_id,
+        'url': _node_attr(post_node.css_first('a.job-item'), 'href'),
+        'unit_name': _node_text(post_node.css_first('h4.square-content__title')),
+        'position': _node_text(post_node.css_first('h4.vacancy_content')),
+        'image_url': _node_attr(post_node.css_first('img.wp-post-image'), 'src'),
+        'categories': categories,
+        'units': units,
+        'status': status
+    }
+
+
+def _find_post_elements(html_content):
+    """
+    Return (post elements, parse function) for every div#post-XXXXX.
+    
+    Uses the lexbor C parser when selectolax is installed, otherwise
+    BeautifulSoup.
+    """
+    if HAS_SELECTOLAX:
+        tree = LexborHTMLParser(html_content)
+        nodes = [node for node in tree.css('div[id^="post-"]')
+                 if _POST_DIV_ID_RE.match(node.attributes.get('id') or '')]
+        return nodes, parse_post_node
+    
+    soup = BeautifulSoup(html_content, BS4_PARSER, from_encoding='utf-8')
+    return soup.find_all('div', id=_POST_DIV_ID_RE), parse_post_div
+
+
 def parse_html_file(html_path):
     """Parse a single HTML file and extract all job postings."""
     try:
-        with open(html_path, 'r', encoding='utf-8') as f:
+        with open(html_path, 'rb') as f:
             html_content = f.read()
         
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
         # Find all divs with id matching "post-XXXXX"
-        post_divs = soup.find_all('div', id=re.compile(r'^post-\d+$'))
+        post_divs, parse_post = _find_post_elements(html_content)
         
         posts = []
         for post_div in post_divs:
             try:
-                post_data = parse_post_div(post_div)
+                post_data = parse_post(post_div)
                 if post_data['post_id']:  # Only add if we got a valid post ID
                     posts.append(post_data)
             except Exception as e:
@@ -200,4 +302,5 @@ def main():
 
 
 if __name__ == '__main__':
+    setup_logging()
     main()
@@ -5,24 +5,142 @@ Stage 3: Download individual job pages
 Downloads the HTML for each job posting found in Stage 2 JSON output.
 Stores in data/job-pages/{ID:3}/{ID:3}/job_ID.html
 Also generates metadata JSON for each job.
+
+Usage:
+    python3 scripts/3_download_job_pages.py              # Download new jobs
+    python3 scripts/3_download_job_pages.py --verbose    # Per-job debug logging
+    python3 scripts/3_download_job_pages.py --verify     # Re-download pages that don't look like HTML
+    LOG_LEVEL=WARNING python3 scripts/3_download_job_pages.py   # Quieter cron output
 """
 
+import atexit
+import html
 import json
 import logging
+import multiprocessing
+import os
+import queue
 import re
+import threading
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from datetime import datetime
+from urllib.parse import urlsplit
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from fs_walk import iter_files
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+try:
+    import lxml.html
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import brotli  # noqa: F401 - enables transparent 'br' decoding in urllib3
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+# Only advertise brotli when it can be decoded, otherwise response.text is garbage
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36',
+    'Accept-Encoding': 'gzip, deflate, br' if HAS_BROTLI else 'gzip, deflate',
+}
+
+
+# Root of the data/job-pages/AAA/BBB/job_ID.html tree, kept as a plain string
+_JOB_PAGES_BASE = 'data/job-pages'
+
+# Touched whenever a run saves pages, so "last download" is a single stat
+LAST_RUN_SENTINEL = f'{_JOB_PAGES_BASE}/.last_run'
+
+# Concurrent downloads; matches the session's connection pool size
+MAX_WORKERS = 16
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
+# Cap on in-flight requests to any single host, to stay clear of rate limits
+PER_HOST_LIMIT = 8
+
+# Pages needing metadata before generation is worth a process pool
+METADATA_POOL_MIN = 64
+
+_host_slots = defaultdict(lambda: threading.BoundedSemaphore(PER_HOST_LIMIT))
+_host_slots_lock = threading.Lock()
+
+
+def setup_logging():
+    """
+    Configure logging (LOG_LEVEL env, INFO by default; main(verbose=True) enables DEBUG).
+    
+    Download threads only enqueue records; a listener thread does the file
+    I/O. Called by the entry point rather than at import, so process pool
+    workers importing this module start no threads.
+    """
+    log_queue = queue.Queue()
+    listener = QueueListener(
+        log_queue,
         logging.FileHandler("download_jobs.log"),
         logging.StreamHandler()
-    ]
-)
+    )
+    logging.basicConfig(
+        level=os.environ.get("LOG_LEVEL", "INFO").upper(),
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[QueueHandler(log_queue)]
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+
+def _host_slot(url):
+    """Semaphore bounding concurrent requests to url's host."""
+    host = urlsplit(url).netloc
+    with _host_slots_lock:
+        return _host_slots[host]
+
+
+def _create_session():
+    """Build the HTTP session shared by all job downloads (keep-alive pooling)."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=MAX_WORKERS,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET']
+        )
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# JSON decoder for stage 2 output; both accept the raw file bytes
+_json_loads = orjson.loads if HAS_ORJSON else json.loads
+
+# Marker text shown on the page once a vacancy has been closed, as UTF-8
+# bytes so pages can be checked without decoding them
+_CLOSED_MARKER = 'На жаль, вакансія вже закрита!'.encode('utf-8')
+
 
 def log_cron_stats(new_jobs_found, downloaded, successful, failed, gen_count, skip_count, fail_count):
     """Log cron run statistics to structured stats file."""
@@ -40,22 +158,121 @@ def log_cron_stats(new_jobs_found, downloaded, successful, failed, gen_count, sk
         "metadata_failed": fail_count
     }
     
+    # One write() on an O_APPEND fd is atomic for lines this short (< PIPE_BUF),
+    # so concurrent runs never interleave their records
+    if HAS_ORJSON:
+        line = orjson.dumps(stats, option=orjson.OPT_APPEND_NEWLINE)
+    else:
+        line = (json.dumps(stats, ensure_ascii=False) + "\n").encode("utf-8")
     try:
-        with open(stats_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(stats, ensure_ascii=False) + "\n")
+        fd = os.open(stats_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
     except Exception as e:
         logging.error(f"Failed to write stats file: {e}")
 
 
 def get_job_page_path(post_id):
-    """Get canonical path for a job page based on ID."""
+    """
+    Get canonical path for a job page based on ID.
+    
+    Returns a plain string; this is called for every post, so it avoids
+    building Path objects in the hot loop.
+    """
     id_str = str(post_id).zfill(6)
-    return Path('data') / 'job-pages' / id_str[0:3] / id_str[3:6] / f"job_{post_id}.html"
+    return f"{_JOB_PAGES_BASE}/{id_str[:3]}/{id_str[3:6]}/job_{post_id}.html"
+
+
+def ensure_job_page_dirs(jobs):
+    """Create every job page directory needed by jobs, once per unique dir."""
+    dirs = {os.path.dirname(get_job_page_path(job['post_id'])) for job in jobs}
+    for directory in dirs:
+        os.makedirs(directory, exist_ok=True)
+    return len(dirs)
+
+
+def index_downloaded_pages(base_dir=_JOB_PAGES_BASE, metadata=None):
+    """
+    Map post_id (as str) -> os.stat_result for every non-empty job page.
+    
+    Walks the two-level AAA/BBB bucket tree once with os.scandir so that
+    download checks become dict lookups instead of a stat per post. If a
+    metadata set is passed, the IDs of existing job_ID.json files are
+    collected into it during the same walk.
+    """
+    index = {}
+    try:
+        buckets = os.scandir(base_dir)
+    except FileNotFoundError:
+        return index
+    
+    with buckets:
+        for bucket in buckets:
+            if not bucket.is_dir(follow_symlinks=False):
+                continue
+            with os.scandir(bucket.path) as subdirs:
+                for subdir in subdirs:
+                    if not subdir.is_dir(follow_symlinks=False):
+                        continue
+                    with os.scandir(subdir.path) as entries:
+                        for entry in entries:
+                            name = entry.name
+                            if not name.startswith('job_'):
+                                continue
+                            if name.endswith('.json'):
+                                if metadata is not None:
+                                    metadata.add(name[4:-5])
+                                continue
+                            if not name.endswith('.html'):
+                                continue
+                            stat = entry.stat(follow_symlinks=False)
+                            if stat.st_size > 0:
+                                index[name[4:-5]] = stat
+    
+    return index
 
 
-def is_already_downloaded(post_id):
-    """Check if job page already exists using atomic file check."""
-    return get_job_page_path(post_id).exists()
+def has_html_signature(path):
+    """Check that a saved page starts like an HTML document (reads 64 bytes, no decode)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        head = os.pread(fd, 64, 0).lstrip().lower()
+    finally:
+        os.close(fd)
+    return head.startswith(b'<!doctype') or head.startswith(b'<html')
+
+
+def verify_downloaded_pages(index):
+    """Drop pages without an HTML signature from index so they are fetched again."""
+    invalid = [post_id for post_id in index if not has_html_signature(get_job_page_path(post_id))]
+    for post_id in invalid:
+        del index[post_id]
+    if invalid:
+        logging.info(f"Verify: {len(invalid)} invalid page(s) queued for re-download")
+    return index
+
+
+def is_already_downloaded(post_id, index=None):
+    """
+    Check if job page already exists.
+    
+    With an index from index_downloaded_pages() this is a dict lookup;
+    otherwise it falls back to a single stat call. Pages are written
+    atomically (temp file + rename), so any non-empty file at the
+    canonical path is a complete download.
+    """
+    if index is not None:
+        return str(post_id) in index
+    
+    try:
+        return os.stat(get_job_page_path(post_id)).st_size > 0
+    except FileNotFoundError:
+        return False
 
 
 def is_job_closed(post_id):
@@ -64,15 +281,9 @@ def is_job_closed(post_id):
     A job is considered closed if the HTML contains:
     'На жаль, вакансія вже закрита!'
     """
-    path = get_job_page_path(post_id)
-    
-    if not path.exists():
-        return False
-    
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            if 'На жаль, вакансія вже закрита!' in content:
+        with open(get_job_page_path(post_id), 'rb') as f:
+            if _CLOSED_MARKER in f.read():
                 return True
     except Exception:
         pass
@@ -80,49 +291,171 @@ def is_job_closed(post_id):
     return False
 
 
+# Page chrome dropped before picking the content node (selectolax path)
+_STRIP_SELECTOR = 'script, style, nav, footer, aside'
+
+# Content candidates in priority order, mirroring the regex fallback
+_CONTENT_SELECTORS = (
+    'main',
+    'article',
+    'div[class*="content"], div[class*="main"], div[class*="posting"], div[class*="job"]',
+    'body',
+)
+
+
+# Elements dropped by the fallback tag scanner, matching _STRIP_SELECTOR
+_STRIP_TAGS = ('script', 'style', 'nav', 'footer', 'aside')
+
+# Closing tag for each stripped element; searched forward only, no backtracking
+_CLOSE_TAG_RE = {tag: re.compile(rf'</{tag}\s*>', re.IGNORECASE) for tag in _STRIP_TAGS}
+
+# Characters that may follow a tag name inside an opening tag
+_TAG_NAME_END = frozenset('> \t\r\n/')
+
+# Regex fallback used when selectolax is not installed, compiled once
+_MAIN_PATTERNS = (
+    re.compile(r'<main[^>]*>(.*?)</main>', re.DOTALL | re.IGNORECASE),
+    re.compile(r'<article[^>]*>(.*?)</article>', re.DOTALL | re.IGNORECASE),
+    re.compile(r'<div[^>]*class="[^"]*(?:content|main|posting|job)[^"]*"[^>]*>(.*?)</div>',
+               re.DOTALL | re.IGNORECASE),
+)
+_BODY_RE = re.compile(r'<body[^>]*>(.*?)</body>', re.DOTALL | re.IGNORECASE)
+
+
+def _extract_main_content_lexbor(html_content):
+    """
+    Extract main content with the lexbor C parser in a single tree walk.
+    
+    Accepts str or raw UTF-8 bytes; bytes are parsed without a Python-side
+    decode.
+    """
+    tree = LexborHTMLParser(html_content)
+    for node in tree.css(_STRIP_SELECTOR):
+        node.decompose()
+    
+    for selector in _CONTENT_SELECTORS:
+        node = tree.css_first(selector)
+        if node is not None:
+            return (node.inner_html or '')[:5000]  # First 5000 chars
+    
+    return ''
+
+
+# Same candidates as _CONTENT_SELECTORS, for the lxml path
+_CONTENT_XPATHS = (
+    '//main',
+    '//article',
+    '//div[contains(@class, "content") or contains(@class, "main")'
+    ' or contains(@class, "posting") or contains(@class, "job")]',
+    '//body',
+)
+
+
+def _extract_main_content_lxml(html_content):
+    """
+    Extract main content with lxml when selectolax is not installed.
+    
+    Strips the same page chrome in C (etree.strip_elements) and picks the
+    first content candidate, returning its inner HTML like the lexbor path.
+    """
+    if isinstance(html_content, bytes):
+        doc = lxml.html.document_fromstring(
+            html_content, parser=lxml.html.HTMLParser(encoding='utf-8')
+        )
+    else:
+        doc = lxml.html.document_fromstring(html_content)
+    etree.strip_elements(doc, *_STRIP_TAGS, with_tail=False)
+    
+    for xpath in _CONTENT_XPATHS:
+        nodes = doc.xpath(xpath)
+        if nodes:
+            node = nodes[0]
+            # node.text comes back unescaped; re-escape it to stay valid HTML
+            inner = html.escape(node.text or '', quote=False) + ''.join(
+                etree.tostring(child, encoding='unicode') for child in node
+            )
+            return inner[:5000]  # First 5000 chars
+    
+    return ''
+
+
+def _strip_tags(html, tags=_STRIP_TAGS):
+    """
+    Remove <tag>...</tag> blocks for each of tags in one left-to-right pass.
+    
+    Jumps between '<' characters with str.find and copies only the kept
+    spans, instead of running one backtracking re.sub per tag. An element
+    without a closing tag is left in place.
+    """
+    parts = []
+    keep_from = 0
+    i = html.find('<')
+    while i != -1:
+        head = html[i + 1:i + 8].lower()
+        for tag in tags:
+            if head.startswith(tag) and html[i + 1 + len(tag):i + 2 + len(tag)] in _TAG_NAME_END:
+                close = _CLOSE_TAG_RE[tag].search(html, i + 1 + len(tag))
+                if close:
+                    parts.append(html[keep_from:i])
+                    keep_from = close.end()
+                break
+        i = html.find('<', max(i + 1, keep_from))
+    parts.append(html[keep_from:])
+    return ''.join(parts)
+
+
 def extract_main_content(html_content):
-    """Extract main job posting content from HTML."""
+    """Extract main job posting content from HTML (str or UTF-8 bytes)."""
+    if not html_content:
+        return ""
+    
     try:
-        # Remove scripts and styles
-        content = re.sub(r'<script[^>]*>.*?</script>', '', html_content, flags=re.DOTALL | re.IGNORECASE)
-        content = re.sub(r'<style[^>]*>.*?</style>', '', content, flags=re.DOTALL | re.IGNORECASE)
+        if HAS_SELECTOLAX:
+            return _extract_main_content_lexbor(html_content)
         
-        # Try to find main article/content area
-        patterns = [
-            r'<main[^>]*>(.*?)</main>',
-            r'<article[^>]*>(.*?)</article>',
-            r'<div[^>]*class="[^"]*(?:content|main|posting|job)[^"]*"[^>]*>(.*?)</div>',
-        ]
+        if HAS_LXML:
+            return _extract_main_content_lxml(html_content)
+        
+        if isinstance(html_content, bytes):
+            html_content = html_content.decode('utf-8', errors='replace')
         
-        for pattern in patterns:
-            match = re.search(pattern, content, re.IGNORECASE | re.DOTALL)
+        # Remove scripts, styles and page chrome
+        content = _strip_tags(html_content)
+        
+        # Try to find main article/content area
+        for pattern in _MAIN_PATTERNS:
+            match = pattern.search(content)
             if match:
                 return match.group(1)[:5000]  # First 5000 chars
         
         # Fallback: use first 5000 chars of body
-        body_match = re.search(r'<body[^>]*>(.*?)</body>', content, re.IGNORECASE | re.DOTALL)
+        body_match = _BODY_RE.search(content)
         if body_match:
             return body_match.group(1)[:5000]
         
         return content[:5000]
     except Exception as e:
-        logging.debug(f"Error extracting content: {e}")
+        logging.debug("Error extracting content: %s", e)
         return ""
 
 
-def get_new_jobs_from_json():
-    """Collect all job URLs from consolidated JSON file or all daily JSON files."""
+def get_new_jobs_from_json(downloaded=None):
+    """
+    Collect all job URLs from consolidated JSON file or all daily JSON files.
+    
+    downloaded is an index from index_downloaded_pages(); it is built here
+    when not supplied.
+    """
     new_jobs = []
     
     # Try consolidated file first (more efficient, no duplicates)
     consolidated_path = Path('data/consolidated_unique.json')
     if consolidated_path.exists():
         logging.info("Using consolidated_unique.json")
-        json_files = [consolidated_path]
+        json_files = [str(consolidated_path)]
     else:
-        # Fallback to individual daily files
-        base_path = Path('data')
-        json_files = list(base_path.rglob('output_*.json'))
+        # Fallback to individual daily files (job-pages only holds per-job metadata)
+        json_files = list(iter_files('data', 'output_', '.json', skip_dirs=('job-pages',)))
     
     if not json_files:
         logging.info("No JSON files found")
@@ -130,121 +463,199 @@ def get_new_jobs_from_json():
     
     logging.info(f"Found {len(json_files)} JSON file(s) to check")
     
+    if downloaded is None:
+        downloaded = index_downloaded_pages()
+    
+    # Post IDs already considered, so each one is checked against disk once
+    seen = set()
+    
     for json_file in json_files:
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                posts = data.get('posts', [])
+            with open(json_file, 'rb') as f:
+                data = _json_loads(f.read())
+            posts = data.get('posts', [])
+            source_date = os.path.basename(os.path.dirname(json_file))
+            
+            for post in posts:
+                post_id = post.get('post_id')
+                url = post.get('url', '')
                 
-                for post in posts:
-                    post_id = post.get('post_id')
-                    url = post.get('url', '')
-                    
-                    # Only add if not already downloaded
-                    if post_id and url and not is_already_downloaded(post_id):
-                        new_jobs.append({
-                            'post_id': post_id,
-                            'url': url,
-                            'position': post.get('position', 'Unknown'),
-                            'unit': post.get('unit_name', 'Unknown'),
-                            'source_date': json_file.parent.name
-                        })
+                if not post_id or not url or post_id in seen:
+                    continue
+                seen.add(post_id)
+                
+                # Only add if not already downloaded
+                if not is_already_downloaded(post_id, downloaded):
+                    new_jobs.append({
+                        'post_id': post_id,
+                        'url': url,
+                        'position': post.get('position', 'Unknown'),
+                        'unit': post.get('unit_name', 'Unknown'),
+                        'source_date': source_date
+                    })
         except Exception as e:
-            logging.warning(f"Error reading {json_file}: {e}")
-    
-    # Remove duplicates by post_id
-    unique_jobs = {}
-    for job in new_jobs:
-        if job['post_id'] not in unique_jobs:
-            unique_jobs[job['post_id']] = job
+            logging.warning("Error reading %s: %s", json_file, e)
     
-    new_jobs = list(unique_jobs.values())
     logging.info(f"Found {len(new_jobs)} new job URLs to download")
     
     return new_jobs
 
 
-def generate_all_job_metadata(skip_existing=True):
-    """Generate metadata JSON files for all downloaded jobs."""
-    job_pages_dir = Path('data') / 'job-pages'
-    if not job_pages_dir.exists():
-        return 0, 0, 0
+def write_metadata(path, metadata):
+    """
+    Serialize metadata in memory (orjson when available) and save it with one write.
+    
+    Output is compact single-line JSON; these files are read by code, not
+    people, and indentation roughly doubled their size.
+    """
+    if HAS_ORJSON:
+        data = orjson.dumps(metadata)
+    else:
+        data = json.dumps(metadata, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def _generate_metadata(item):
+    """
+    Write job_ID.json for one downloaded page; item is (id_str, mtime)
+    with mtime in whole seconds, taken from the index's cached stat.
+    
+    Runs in a worker process, so it only touches its own files and
+    reports back True on success.
+    """
+    id_str, mtime = item
+    try:
+        post_id = int(id_str)
+        html_file = get_job_page_path(id_str)
+        json_file = html_file[:-len('.html')] + '.json'
+        
+        # One binary read serves both the closed check and extraction
+        with open(html_file, 'rb') as f:
+            raw = f.read()
+        
+        is_closed = _CLOSED_MARKER in raw
+        main_content = '' if is_closed else extract_main_content(raw)
+        
+        metadata = {
+            'post_id': post_id,
+            'url': '',
+            'position': 'Unknown',
+            'unit_name': 'Unknown',
+            'status': 'closed' if is_closed else 'open',
+            'is_closed': is_closed,
+            'content': main_content,
+            'downloaded_at': str(mtime)
+        }
+        
+        write_metadata(json_file, metadata)
+        
+        return True
+    except Exception as e:
+        logging.debug("Failed to generate metadata for job %s: %s", id_str, e)
+        return False
+
+
+def _list_metadata_ids(pages):
+    """
+    Collect post IDs that already have job_ID.json, for the pages' directories.
     
-    html_files = list(job_pages_dir.rglob('job_*.html'))
-    if not html_files:
+    Lists each bucket directory once instead of stat-ing a JSON path per page.
+    """
+    metadata_ids = set()
+    for directory in {os.path.dirname(get_job_page_path(id_str)) for id_str in pages}:
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.startswith('job_') and name.endswith('.json'):
+                        metadata_ids.add(name[4:-5])
+        except FileNotFoundError:
+            continue
+    return metadata_ids
+
+
+def generate_all_job_metadata(skip_existing=True, pages=None, metadata_ids=None):
+    """
+    Generate metadata JSON files for all downloaded jobs.
+    
+    pages and metadata_ids come from index_downloaded_pages(); when not
+    supplied the job-pages tree is indexed here. Reusing main()'s index
+    avoids a second walk and a per-page exists() check. Pages saved after
+    the index was built already carry metadata from download_job_page().
+    
+    Content extraction is CPU-bound, so batches of at least
+    METADATA_POOL_MIN pages are spread over a process pool. Its workers
+    are spawned, not forked: forking while the log listener thread holds a
+    lock can deadlock the child.
+    """
+    if pages is None:
+        metadata_ids = set()
+        pages = index_downloaded_pages(metadata=metadata_ids)
+    if not pages:
         return 0, 0, 0
+    if skip_existing and metadata_ids is None:
+        metadata_ids = _list_metadata_ids(pages)
     
-    generated = 0
     skipped = 0
     failed = 0
+    todo = []
     
-    logging.debug(f"Generating metadata for {len(html_files)} jobs...")
-    
-    for html_file in html_files:
-        try:
-            post_id = int(html_file.stem.split('_')[1])
-        except (ValueError, IndexError):
+    for id_str, stat in pages.items():
+        if not id_str.isdigit():
             failed += 1
             continue
         
-        json_file = html_file.with_name(f"job_{post_id}.json")
-        if json_file.exists() and skip_existing:
+        if skip_existing and metadata_ids is not None and id_str in metadata_ids:
             skipped += 1
             continue
         
-        try:
-            with open(html_file, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
-            is_closed = is_job_closed(post_id)
-            main_content = extract_main_content(html_content)
-            
-            metadata = {
-                'post_id': post_id,
-                'url': '',
-                'position': 'Unknown',
-                'unit_name': 'Unknown',
-                'status': 'closed' if is_closed else 'open',
-                'is_closed': is_closed,
-                'content': main_content,
-                'downloaded_at': str(int(html_file.stat().st_mtime))
-            }
-            
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, ensure_ascii=False, indent=2)
-            
-            generated += 1
-        except Exception as e:
-            logging.debug(f"Failed to generate metadata for job {post_id}: {e}")
-            failed += 1
+        todo.append((id_str, stat.st_mtime_ns // 1_000_000_000))
+    
+    logging.debug("Generating metadata for %d jobs...", len(todo))
+    
+    if len(todo) >= METADATA_POOL_MIN:
+        with ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn')) as executor:
+            results = list(executor.map(_generate_metadata, todo, chunksize=32))
+    else:
+        results = [_generate_metadata(item) for item in todo]
+    
+    generated = sum(results)
+    failed += len(results) - generated
     
     return generated, skipped, failed
 
 
-def download_job_page(job_data):
+def download_job_page(job_data, session):
     """Download individual job page and create metadata JSON."""
     url = job_data['url']
     post_id = job_data['post_id']
     
     try:
-        logging.debug(f"Downloading job {post_id}: {url}")
+        logging.debug("Downloading job %s: %s", post_id, url)
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, timeout=5, headers=headers)
+        with _host_slot(url):
+            response = session.get(url, timeout=5)
         response.raise_for_status()
         
-        # Get canonical path
+        # Get canonical path (directory is pre-created by ensure_job_page_dirs)
         output_path = get_job_page_path(post_id)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(response.text)
+        # Write the raw body to a temp file and rename so a partial page is
+        # never visible; the site serves UTF-8, so no re-encode is needed
+        body = response.content
+        tmp_path = output_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+            f.flush()
+            # mtime from the open fd; the rename below does not change it
+            mtime = os.fstat(f.fileno()).st_mtime
+        os.replace(tmp_path, output_path)
         
-        # Check if job is closed
-        is_closed = is_job_closed(post_id)
-        main_content = extract_main_content(response.text)
+        # Check if job is closed (on the body in memory, no re-read)
+        is_closed = _CLOSED_MARKER in body
+        # A closed posting's page is boilerplate, so don't bother parsing it
+        main_content = '' if is_closed else extract_main_content(body)
         
         # Create metadata JSON file
         metadata = {
@@ -255,40 +666,50 @@ def download_job_page(job_data):
             'status': 'closed' if is_closed else 'open',
             'is_closed': is_closed,
             'content': main_content,
-            'downloaded_at': str(Path(output_path).stat().st_mtime)
+            'downloaded_at': str(mtime)
         }
         
-        json_path = output_path.with_name(f"job_{post_id}.json")
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        json_path = output_path[:-len('.html')] + '.json'
+        write_metadata(json_path, metadata)
         
         if is_closed:
-            logging.debug(f"  ✓ Saved job_{post_id} (⚠️ CLOSED)")
+            logging.debug("  ✓ Saved job_%s (⚠️ CLOSED)", post_id)
         else:
-            logging.debug(f"  ✓ Saved job_{post_id}")
+            logging.debug("  ✓ Saved job_%s", post_id)
         
-        return True, str(output_path)
+        return True, output_path
         
     except requests.exceptions.Timeout:
-        logging.debug(f"  ✗ Timeout: {post_id}")
+        logging.debug("  ✗ Timeout: %s", post_id)
         return False, None
     except requests.exceptions.RequestException as e:
-        logging.debug(f"  ✗ Error {post_id}: {type(e).__name__}")
+        logging.debug("  ✗ Error %s: %s", post_id, type(e).__name__)
         return False, None
     except Exception as e:
-        logging.debug(f"  ✗ Unexpected error for {post_id}: {type(e).__name__}")
+        logging.debug("  ✗ Unexpected error for %s: %s", post_id, type(e).__name__)
         return False, None
 
 
-def main():
-    """Main entry point."""
+def main(verbose=False, verify=False):
+    """
+    Main entry point.
+    
+    verbose enables per-job DEBUG logging; verify re-downloads saved pages
+    that don't look like HTML.
+    """
+    if verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
     
     logging.info("=" * 70)
     logging.info("STAGE 3: Downloading individual job pages")
     logging.info("=" * 70)
     
-    # Get new jobs
-    new_jobs = get_new_jobs_from_json()
+    # Get new jobs (one walk of job-pages serves the download check and metadata)
+    metadata_ids = set()
+    downloaded = index_downloaded_pages(metadata=metadata_ids)
+    if verify:
+        downloaded = verify_downloaded_pages(downloaded)
+    new_jobs = get_new_jobs_from_json(downloaded)
     new_jobs_found = len(new_jobs)
     
     if not new_jobs:
@@ -306,19 +727,30 @@ def main():
     else:
         logging.info(f"Downloading {len(jobs_to_download)} new job pages")
     
+    ensure_job_page_dirs(jobs_to_download)
+    
     # Download pages with progress
     successful = 0
     failed = 0
     
-    for idx, job in enumerate(jobs_to_download, 1):
-        progress_pct = (idx / len(jobs_to_download)) * 100
-        logging.info(f"[{idx}/{len(jobs_to_download)} ({progress_pct:.0f}%)] {job['position'][:50]}")
-        success, filepath = download_job_page(job)
-        
-        if success:
-            successful += 1
-        else:
-            failed += 1
+    total = len(jobs_to_download)
+    session = _create_session()
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = {executor.submit(download_job_page, job, session): job for job in jobs_to_download}
+            
+            for idx, future in enumerate(as_completed(futures), 1):
+                job = futures[future]
+                success, filepath = future.result()
+                logging.info("[%d/%d (%.0f%%)] %s %s", idx, total, idx / total * 100,
+                             "✓" if success else "✗", job['position'][:50])
+                
+                if success:
+                    successful += 1
+                else:
+                    failed += 1
+    finally:
+        session.close()
     
     logging.info("=" * 70)
     logging.info(f"Download Summary:")
@@ -328,9 +760,14 @@ def main():
     if len(new_jobs) > MAX_DOWNLOADS:
         logging.info(f"  Remaining: {len(new_jobs) - MAX_DOWNLOADS}")
     
+    if successful:
+        Path(LAST_RUN_SENTINEL).touch()
+    
     # Generate metadata for all jobs
     logging.info("Generating/updating metadata files...")
-    gen_count, skip_count, fail_count = generate_all_job_metadata(skip_existing=True)
+    gen_count, skip_count, fail_count = generate_all_job_metadata(
+        skip_existing=True, pages=downloaded, metadata_ids=metadata_ids
+    )
     logging.info(f"Metadata Summary:")
     logging.info(f"  Generated: {gen_count} ✓")
     logging.info(f"  Skipped: {skip_count}")
@@ -343,4 +780,12 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Stage 3: Download individual job pages")
+    parser.add_argument("--verbose", action="store_true", help="Per-job debug logging")
+    parser.add_argument("--verify", action="store_true", help="Re-download pages that don't look like HTML")
+    args = parser.parse_args()
+    
+    setup_logging()
+    main(verbose=args.verbose, verify=args.verify)
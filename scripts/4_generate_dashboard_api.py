@@ -8,17 +8,22 @@ Generates api/list-json-files.json with all available job data.
 
 import json
 import logging
+import os
 from pathlib import Path
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("debug.log"),
-        logging.StreamHandler()
-    ]
-)
+from fs_walk import iter_files
+
+
+def setup_logging():
+    """Send this stage's log records to debug.log and the console."""
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[
+            logging.FileHandler("debug.log"),
+            logging.StreamHandler()
+        ]
+    )
 
 
 def main():
@@ -34,9 +39,9 @@ def main():
         logging.error(f"Directory data does not exist")
         return
     
-    # Find all JSON files
-    json_files = list(base_path.rglob('*.json'))
-    json_files = [f for f in json_files if f.name != 'consolidated_unique.json']
+    # Find all JSON files, except consolidated_unique.json
+    json_files = [Path(p) for p in iter_files(str(base_path), suffix='.json')
+                  if os.path.basename(p) != 'consolidated_unique.json']
     
     logging.info(f"Found {len(json_files)} JSON files")
     
@@ -70,4 +75,5 @@ def main():
 
 
 if __name__ == '__main__':
+    setup_logging()
     main()
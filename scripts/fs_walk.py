@@ -0,0 +1,31 @@
+"""
+Shared os.scandir walker for the data tree.
+
+Used by the pipeline stages and by the scripts in tools/ (which put this
+directory on sys.path) instead of each keeping its own copy.
+"""
+
+import os
+
+
+def iter_files(root, prefix='', suffix='', skip_dirs=()):
+    """
+    Yield paths of files named prefix*suffix under root, as plain strings.
+    
+    Walks with os.scandir and an explicit stack, so no Path objects are
+    built and deep trees don't recurse. Directories named in skip_dirs are
+    not entered; a missing root yields nothing.
+    """
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if name not in skip_dirs:
+                            stack.append(entry.path)
+                    elif name.startswith(prefix) and name.endswith(suffix):
+                        yield entry.path
+        except (FileNotFoundError, NotADirectoryError):
+            continue
@@ -7,30 +7,31 @@ Installation:
     python3 scripts/install_hooks.py
 """
 
+import re
 import subprocess
 import sys
 import os
 
-def run_command(cmd):
-    """Run a command and return exit code."""
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+# Staged paths that should trigger the test run (any .py under scripts/)
+_SCRIPT_PY_RE = re.compile(rb'scripts/.*\.py\Z', re.DOTALL)
+
+def run_command(cmd, text=True):
+    """Run a command (argv list, no shell) and return exit code."""
+    result = subprocess.run(cmd, capture_output=True, text=text)
     return result.returncode, result.stdout, result.stderr
 
 
 def get_staged_files():
-    """Get list of staged files."""
-    code, stdout, _ = run_command('git diff --cached --name-only')
+    """Get list of staged files as raw bytes paths (NUL-separated, no decoding)."""
+    code, stdout, _ = run_command(['git', 'diff', '--cached', '--name-only', '-z'], text=False)
     if code != 0:
         return []
-    return stdout.strip().split('\n')
+    return [f for f in stdout.split(b'\0') if f]
 
 
 def has_script_changes(files):
     """Check if any scripts were modified."""
-    for f in files:
-        if f.startswith('scripts/') and f.endswith('.py'):
-            return True
-    return False
+    return any(_SCRIPT_PY_RE.match(f) for f in files)
 
 
 def run_tests():
@@ -39,7 +40,7 @@ def run_tests():
     print("Running tests for modified scripts...")
     print("="*70 + "\n")
     
-    code, stdout, stderr = run_command('python3 run_tests.py')
+    code, stdout, stderr = run_command([sys.executable, 'run_tests.py'])
     
     print(stdout)
     if stderr:
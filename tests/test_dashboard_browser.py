@@ -6,12 +6,15 @@ Starts internal server instance for testing.
 Run: python tests/test_dashboard_browser.py
 """
 
+import http.client
 import subprocess
 import time
 import sys
 import os
 import signal
+import socket
 from pathlib import Path
+from urllib.parse import urlsplit
 import json
 import threading
 
@@ -22,6 +25,10 @@ except ImportError:
     sys.exit(1)
 
 
+# Maps each selector to whether it matches anything, evaluated in the page
+DOM_PRESENCE_JS = "(sels) => Object.fromEntries(sels.map(s => [s, !!document.querySelector(s)]))"
+
+
 class DashboardServer:
     """Internal server instance for testing."""
     def __init__(self, port=8001):
@@ -47,22 +54,29 @@ class DashboardServer:
                 env=env
             )
             
-            # Wait for server to start with retry
-            max_retries = 10
-            for attempt in range(max_retries):
-                time.sleep(1)
-                
-                # Verify server is running
-                import urllib.request
+            # Wait for the port to accept connections, polling fast at first
+            # and backing off, instead of sleeping a full second per try
+            timeout = 10
+            delay = 0.02
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
                 try:
-                    urllib.request.urlopen(self.base_url, timeout=2)
+                    with socket.create_connection(('localhost', self.port), timeout=0.1):
+                        pass
+                except OSError:
+                    if self.process.poll() is not None:
+                        break  # Server exited, no point waiting
+                    time.sleep(delay)
+                    delay = min(delay * 1.5, 0.2)
+                    continue
+                
+                # Port is open; one HEAD request confirms it is serving
+                if check_server_running(self.base_url):
                     print(f"✓ Internal server started at {self.base_url}")
                     return True
-                except Exception:
-                    if attempt < max_retries - 1:
-                        continue
+                break
                     
-            print(f"✗ Server failed to start after {max_retries} attempts")
+            print(f"✗ Server failed to start at {self.base_url}")
             return False
                 
         except Exception as e:
@@ -207,15 +221,18 @@ class DashboardTester:
             ("h1, h2", "Header element"),
         ]
 
+        # Resolve every selector in one page.evaluate round-trip
+        try:
+            found = page.evaluate(DOM_PRESENCE_JS, [selector for selector, _ in tests])
+        except Exception as e:
+            self._fail(f"DOM test failed: {str(e)}")
+            return
+
         for selector, description in tests:
-            try:
-                element = page.query_selector(selector)
-                if element:
-                    self._pass(f"Found {description} ({selector})")
-                else:
-                    self._fail(f"Missing {description} ({selector})")
-            except Exception as e:
-                self._fail(f"DOM test for {selector} failed: {str(e)}")
+            if found.get(selector):
+                self._pass(f"Found {description} ({selector})")
+            else:
+                self._fail(f"Missing {description} ({selector})")
 
     def _test_data_loading(self, page):
         """Test that data loads and displays."""
@@ -284,13 +301,16 @@ class DashboardTester:
 
 
 def check_server_running(base_url="http://localhost:8000"):
-    """Check if dashboard server is running."""
+    """Check if dashboard server is running (HEAD / answered without a server error)."""
+    url = urlsplit(base_url)
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=2)
     try:
-        import urllib.request
-        urllib.request.urlopen(base_url, timeout=2)
-        return True
-    except Exception:
+        conn.request('HEAD', '/')
+        return conn.getresponse().status < 500
+    except (OSError, http.client.HTTPException):
         return False
+    finally:
+        conn.close()
 
 
 if __name__ == "__main__":
@@ -4,10 +4,42 @@ Dashboard error detection and console log analyzer.
 Tests for JavaScript errors and console issues.
 """
 
+import functools
+import itertools
 import json
 import re
+from collections import Counter
 from pathlib import Path
 
+# Substrings counted by validate_js_syntax; none can overlap another, so one
+# alternation pass gives the same totals as a str.count() per token
+_COUNTED_TOKENS = (
+    '<script', '</script', '<div', '</div', 'try {', '} catch (e) {',
+    'fetch(', 'new Chart(', 'addEventListener',
+)
+_TOKEN_RE = re.compile('|'.join(re.escape(token) for token in _COUNTED_TOKENS))
+
+
+# Globals the dashboard script must reference; one capture group per name so
+# a single finditer pass tells which of them occur
+_JS_VARIABLES = {
+    'allData': r'\ballData\b',
+    'window.uniquePosts': r'window\.uniquePosts',
+    'displayJobTracking': r'displayJobTracking\(',
+}
+_JS_VARIABLES_RE = re.compile('|'.join(f'({pattern})' for pattern in _JS_VARIABLES.values()))
+
+
+def count_tokens(content):
+    """Count every _COUNTED_TOKENS substring in a single scan of content."""
+    return Counter(_TOKEN_RE.findall(content))
+
+
+@functools.lru_cache(maxsize=1)
+def _dashboard_text():
+    """Read dashboard.html once; shared by the syntax and function checks."""
+    return Path('dashboard.html').read_text()
+
 
 def validate_js_syntax():
     """Validate JavaScript syntax in dashboard.html"""
@@ -18,33 +50,34 @@ def validate_js_syntax():
         print("Error: dashboard.html not found")
         return False
     
-    content = dashboard_file.read_text()
+    content = _dashboard_text()
     
     errors = []
     warnings = []
+    counts = count_tokens(content)
     
     # Check for unclosed tags
-    if content.count('<script') != content.count('</script'):
+    if counts['<script'] != counts['</script']:
         errors.append("Unclosed <script> tags")
     
-    if content.count('<div') != content.count('</div'):
-        warnings.append(f"Mismatched <div> tags: {content.count('<div')} opens, {content.count('</div')} closes")
+    if counts['<div'] != counts['</div']:
+        warnings.append(f"Mismatched <div> tags: {counts['<div']} opens, {counts['</div']} closes")
     
     # Check for common JS errors
     if 'window.persistenceChart.destroy()' in content:
         if 'typeof window.persistenceChart.destroy === \'function\'' not in content:
             warnings.append("Potential: persistenceChart.destroy() called without type check")
     
-    # Check for undefined variables
-    js_patterns = {
-        'allData': r'\ballData\b',
-        'window.uniquePosts': r'window\.uniquePosts',
-        'displayJobTracking': r'displayJobTracking\(',
-    }
+    # Check for undefined variables (stop scanning once all have been seen)
+    var_names = list(_JS_VARIABLES)
+    found = set()
+    for match in _JS_VARIABLES_RE.finditer(content):
+        found.add(match.lastindex - 1)
+        if len(found) == len(var_names):
+            break
     
-    for var_name, pattern in js_patterns.items():
-        matches = re.findall(pattern, content)
-        if not matches:
+    for idx, var_name in enumerate(var_names):
+        if idx not in found:
             warnings.append(f"Variable '{var_name}' not found in code")
     
     # Check for Chart.js initialization
@@ -53,12 +86,12 @@ def validate_js_syntax():
             warnings.append("Chart.js availability not checked before use")
     
     # Check for fetch calls
-    fetch_count = content.count('fetch(')
+    fetch_count = counts['fetch(']
     print(f"Found {fetch_count} fetch() calls")
     
     # Check for error handlers
-    catch_count = content.count('} catch (e) {')
-    try_count = content.count('try {')
+    catch_count = counts['} catch (e) {']
+    try_count = counts['try {']
     
     if try_count > 0 and catch_count == 0:
         errors.append(f"Found {try_count} try blocks but no catch handlers")
@@ -84,11 +117,11 @@ def validate_js_syntax():
     print("\n" + "=" * 70)
     print("METRICS")
     print("=" * 70)
-    print(f"- Script tags: {content.count('<script')}")
+    print(f"- Script tags: {counts['<script']}")
     print(f"- Try/catch blocks: {try_count}/{catch_count}")
     print(f"- Fetch calls: {fetch_count}")
-    print(f"- Chart initializations: {content.count('new Chart(')}")
-    print(f"- Event listeners: {content.count('addEventListener')}")
+    print(f"- Chart initializations: {counts['new Chart(']}")
+    print(f"- Event listeners: {counts['addEventListener']}")
     
     return len(errors) == 0
 
@@ -97,7 +130,11 @@ def check_json_validity():
     """Check if generated JSON files are valid"""
     
     saved_json_dir = Path('data')
-    json_files = list(saved_json_dir.glob('*.json')) + list(saved_json_dir.glob('*/*.json')) + list(saved_json_dir.glob('*/*/*.json'))
+    # One lazy walk, stopping at the first 10 files; per-job metadata under
+    # job-pages has a different shape, so it is not checked here
+    json_files = list(itertools.islice(
+        (f for f in saved_json_dir.rglob('*.json') if 'job-pages' not in f.parts), 10
+    ))
     
     print("\n" + "=" * 70)
     print("JSON FILE VALIDITY CHECK")
@@ -107,7 +144,7 @@ def check_json_validity():
     invalid = 0
     errors_found = []
     
-    for json_file in json_files[:10]:  # Check first 10 files
+    for json_file in json_files:
         try:
             data = json.loads(json_file.read_text())
             valid += 1
@@ -122,7 +159,7 @@ def check_json_validity():
             invalid += 1
             errors_found.append(f"{json_file.name}: {str(e)}")
     
-    print(f"\nChecked {len(json_files[:10])} JSON files:")
+    print(f"\nChecked {len(json_files)} JSON files:")
     print(f"  ✅ Valid: {valid}")
     print(f"  ❌ Invalid: {invalid}")
     
@@ -137,8 +174,7 @@ def check_json_validity():
 def analyze_dashboard_functions():
     """Analyze dashboard functions for common issues"""
     
-    dashboard_file = Path('dashboard.html')
-    content = dashboard_file.read_text()
+    content = _dashboard_text()
     
     print("\n" + "=" * 70)
     print("FUNCTION ANALYSIS")
@@ -5,7 +5,11 @@ Unit tests for download_job_pages.py
 Tests core functions:
 - get_job_page_path: Path generation logic
 - extract_main_content: HTML content extraction
+- ensure_job_page_dirs: Directory pre-creation
+- index_downloaded_pages: On-disk job page index
+- has_html_signature: Optional --verify page check
 - is_already_downloaded: File existence checks
+- generate_all_job_metadata: Metadata backfill from the page index
 - log_cron_stats: Statistics logging
 """
 
@@ -15,41 +19,93 @@ import json
 from pathlib import Path
 import sys
 import os
+from unittest import mock
 
 # Add scripts directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
 
+import download_job_pages
 from download_job_pages import (
     get_job_page_path,
+    ensure_job_page_dirs,
     extract_main_content,
+    generate_all_job_metadata,
+    has_html_signature,
+    index_downloaded_pages,
     is_already_downloaded,
     is_job_closed,
-    log_cron_stats
+    log_cron_stats,
+    write_metadata,
+    _strip_tags
 )
 
 
+class TempDirTestCase(unittest.TestCase):
+    """
+    Base for tests that work on files relative to the current directory.
+    
+    One temporary directory is created per class; each test runs in its
+    own subdirectory of it, so tests stay isolated without a mkdtemp and
+    rmtree per test.
+    """
+    
+    @classmethod
+    def setUpClass(cls):
+        """Create the shared temporary directory."""
+        cls.temp_dir = tempfile.TemporaryDirectory()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared temporary directory."""
+        cls.temp_dir.cleanup()
+    
+    def setUp(self):
+        """Switch into a fresh subdirectory for this test."""
+        self.original_cwd = os.getcwd()
+        self.workdir = Path(self.temp_dir.name) / self._testMethodName
+        self.workdir.mkdir()
+        os.chdir(self.workdir)
+    
+    def tearDown(self):
+        """Return to the original working directory."""
+        os.chdir(self.original_cwd)
+
+
 class TestJobPagePath(unittest.TestCase):
     """Test get_job_page_path function."""
     
     def test_path_generation(self):
         """Test correct path generation for job IDs."""
         path = get_job_page_path(123456)
-        expected = Path('data/job-pages/123/456/job_123456.html')
+        expected = 'data/job-pages/123/456/job_123456.html'
         self.assertEqual(path, expected)
     
     def test_path_with_small_id(self):
         """Test path generation with small job ID."""
         path = get_job_page_path(42)
-        expected = Path('data/job-pages/000/042/job_42.html')
+        expected = 'data/job-pages/000/042/job_42.html'
         self.assertEqual(path, expected)
     
     def test_path_with_large_id(self):
         """Test path with large job ID."""
         path = get_job_page_path(999999)
-        expected = Path('data/job-pages/999/999/job_999999.html')
+        expected = 'data/job-pages/999/999/job_999999.html'
         self.assertEqual(path, expected)
 
 
+class TestEnsureJobPageDirs(TempDirTestCase):
+    """Test ensure_job_page_dirs function."""
+    
+    def test_creates_unique_dirs(self):
+        """Test that shared parent dirs are created once."""
+        jobs = [{'post_id': 123456}, {'post_id': 123456}, {'post_id': 42}]
+        created = ensure_job_page_dirs(jobs)
+        
+        self.assertEqual(created, 2)
+        for job in jobs:
+            self.assertTrue(Path(get_job_page_path(job['post_id'])).parent.is_dir())
+
+
 class TestExtractMainContent(unittest.TestCase):
     """Test extract_main_content function."""
     
@@ -74,6 +130,12 @@ class TestExtractMainContent(unittest.TestCase):
         self.assertNotIn('color', result)
         self.assertIn('Text', result)
     
+    def test_extract_from_bytes(self):
+        """Test that raw UTF-8 page bytes are accepted."""
+        html = '<html><body><main><h1>Аналітик</h1></main></body></html>'.encode('utf-8')
+        result = extract_main_content(html)
+        self.assertIn('Аналітик', result)
+    
     def test_empty_html(self):
         """Test with empty HTML."""
         result = extract_main_content('')
@@ -84,21 +146,37 @@ class TestExtractMainContent(unittest.TestCase):
         html = '<html><body><div>Some content here</div></body></html>'
         result = extract_main_content(html)
         self.assertIn('Some content', result)
+    
+    @unittest.skipUnless(download_job_pages.HAS_LXML, 'lxml not installed')
+    def test_lxml_tier_keeps_leading_text_escaped(self):
+        """Test that the lxml path re-escapes text before the first child."""
+        html = '<html><body><main>A &lt; b <p>x</p></main></body></html>'
+        with mock.patch.object(download_job_pages, 'HAS_SELECTOLAX', False):
+            result = extract_main_content(html)
+        self.assertEqual(result, 'A &lt; b <p>x</p>')
 
 
-class TestIsAlreadyDownloaded(unittest.TestCase):
-    """Test is_already_downloaded function."""
+class TestStripTags(unittest.TestCase):
+    """Test the _strip_tags scanner used by the regex fallback."""
     
-    def setUp(self):
-        """Create temporary directory for tests."""
-        self.temp_dir = tempfile.TemporaryDirectory()
-        self.original_cwd = os.getcwd()
-        os.chdir(self.temp_dir.name)
+    def test_strips_blocks_case_insensitively(self):
+        """Test script/style/nav blocks are removed regardless of case."""
+        html = '<p>a</p><SCRIPT type="x">1<2</Script ><style>s</style><nav>n</nav><p>b</p>'
+        self.assertEqual(_strip_tags(html), '<p>a</p><p>b</p>')
     
-    def tearDown(self):
-        """Clean up temporary directory."""
-        os.chdir(self.original_cwd)
-        self.temp_dir.cleanup()
+    def test_keeps_similar_tag_names(self):
+        """Test that tags merely starting with a stripped name are kept."""
+        html = '<navbar>x</navbar><p>y</p>'
+        self.assertEqual(_strip_tags(html), html)
+    
+    def test_unclosed_block_is_kept(self):
+        """Test that an element without a closing tag is left in place."""
+        html = '<p>a</p><script>never closed'
+        self.assertEqual(_strip_tags(html), html)
+
+
+class TestIsAlreadyDownloaded(TempDirTestCase):
+    """Test is_already_downloaded function."""
     
     def test_file_not_exists(self):
         """Test when file doesn't exist."""
@@ -108,7 +186,7 @@ class TestIsAlreadyDownloaded(unittest.TestCase):
     def test_file_exists_with_valid_html(self):
         """Test when valid HTML file exists."""
         post_id = 123456
-        path = get_job_page_path(post_id)
+        path = Path(get_job_page_path(post_id))
         path.parent.mkdir(parents=True, exist_ok=True)
         
         # Create valid HTML file
@@ -122,7 +200,7 @@ class TestIsAlreadyDownloaded(unittest.TestCase):
     def test_file_empty(self):
         """Test when file is empty."""
         post_id = 111111
-        path = get_job_page_path(post_id)
+        path = Path(get_job_page_path(post_id))
         path.parent.mkdir(parents=True, exist_ok=True)
         
         # Create empty file
@@ -133,9 +211,9 @@ class TestIsAlreadyDownloaded(unittest.TestCase):
         self.assertFalse(result)
     
     def test_file_without_meta_charset(self):
-        """Test when file has no meta charset tag."""
+        """Test that any non-empty file counts as downloaded (no content sniff)."""
         post_id = 222222
-        path = get_job_page_path(post_id)
+        path = Path(get_job_page_path(post_id))
         path.parent.mkdir(parents=True, exist_ok=True)
         
         # Create HTML without meta charset
@@ -144,22 +222,53 @@ class TestIsAlreadyDownloaded(unittest.TestCase):
             f.write(html_content)
         
         result = is_already_downloaded(post_id)
-        self.assertFalse(result)
+        self.assertTrue(result)
 
 
-class TestIsJobClosed(unittest.TestCase):
-    """Test is_job_closed function."""
+class TestIndexDownloadedPages(TempDirTestCase):
+    """Test index_downloaded_pages function."""
     
-    def setUp(self):
-        """Create temporary directory for tests."""
-        self.temp_dir = tempfile.TemporaryDirectory()
-        self.original_cwd = os.getcwd()
-        os.chdir(self.temp_dir.name)
+    def _write_page(self, post_id, content):
+        """Write a job page at its canonical path."""
+        path = Path(get_job_page_path(post_id))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
     
-    def tearDown(self):
-        """Clean up temporary directory."""
-        os.chdir(self.original_cwd)
-        self.temp_dir.cleanup()
+    def test_missing_directory(self):
+        """Test that a missing job-pages directory yields an empty index."""
+        self.assertEqual(index_downloaded_pages(), {})
+    
+    def test_indexes_non_empty_pages(self):
+        """Test that only non-empty job pages are indexed by post ID."""
+        self._write_page(123456, '<html>Job</html>')
+        self._write_page(42, '<html>Job</html>')
+        self._write_page(111111, '')
+        
+        index = index_downloaded_pages()
+        
+        self.assertEqual(set(index), {'123456', '42'})
+    
+    def test_html_signature(self):
+        """Test the --verify signature check on saved pages."""
+        self._write_page(123456, '  <!DOCTYPE html><html><body>Job</body></html>')
+        self._write_page(654321, 'upstream connect error')
+        
+        self.assertTrue(has_html_signature(get_job_page_path(123456)))
+        self.assertFalse(has_html_signature(get_job_page_path(654321)))
+        self.assertFalse(has_html_signature(get_job_page_path(999999)))
+    
+    def test_lookup_with_index(self):
+        """Test is_already_downloaded consults the index when given."""
+        self._write_page(123456, '<html>Job</html>')
+        index = index_downloaded_pages()
+        
+        self.assertTrue(is_already_downloaded(123456, index))
+        self.assertTrue(is_already_downloaded('123456', index))
+        self.assertFalse(is_already_downloaded(654321, index))
+
+
+class TestIsJobClosed(TempDirTestCase):
+    """Test is_job_closed function."""
     
     def test_job_not_exists(self):
         """Test when job file doesn't exist."""
@@ -169,7 +278,7 @@ class TestIsJobClosed(unittest.TestCase):
     def test_open_job(self):
         """Test open job marking."""
         post_id = 333333
-        path = get_job_page_path(post_id)
+        path = Path(get_job_page_path(post_id))
         path.parent.mkdir(parents=True, exist_ok=True)
         
         html_content = '<html><body><p>Job is open</p></body></html>'
@@ -182,7 +291,7 @@ class TestIsJobClosed(unittest.TestCase):
     def test_closed_job(self):
         """Test closed job detection."""
         post_id = 444444
-        path = get_job_page_path(post_id)
+        path = Path(get_job_page_path(post_id))
         path.parent.mkdir(parents=True, exist_ok=True)
         
         html_content = '<html><body><p>На жаль, вакансія вже закрита!</p></body></html>'
@@ -193,19 +302,64 @@ class TestIsJobClosed(unittest.TestCase):
         self.assertTrue(result)
 
 
-class TestLogCronStats(unittest.TestCase):
-    """Test log_cron_stats function."""
+class TestGenerateAllJobMetadata(TempDirTestCase):
+    """Test generate_all_job_metadata function."""
     
-    def setUp(self):
-        """Create temporary directory for tests."""
-        self.temp_dir = tempfile.TemporaryDirectory()
-        self.original_cwd = os.getcwd()
-        os.chdir(self.temp_dir.name)
+    def test_no_job_pages(self):
+        """Test with no job-pages directory."""
+        self.assertEqual(generate_all_job_metadata(), (0, 0, 0))
     
-    def tearDown(self):
-        """Clean up temporary directory."""
-        os.chdir(self.original_cwd)
-        self.temp_dir.cleanup()
+    def test_generates_missing_and_skips_existing(self):
+        """Test that only pages without metadata get a JSON file."""
+        for post_id in (123456, 654321):
+            path = Path(get_job_page_path(post_id))
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text('<html><body><main>Job</main></body></html>', encoding='utf-8')
+        Path(get_job_page_path(654321)).with_suffix('.json').write_text('{}')
+        
+        result = generate_all_job_metadata(skip_existing=True)
+        
+        self.assertEqual(result, (1, 1, 0))
+        json_path = Path(get_job_page_path(123456)).with_suffix('.json')
+        metadata = json.loads(json_path.read_text(encoding='utf-8'))
+        self.assertEqual(metadata['post_id'], 123456)
+        self.assertFalse(metadata['is_closed'])
+    
+    def test_skips_existing_with_index_only(self):
+        """Test that existing metadata is found when only a page index is passed."""
+        path = Path(get_job_page_path(123456))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('<html><body><main>Job</main></body></html>', encoding='utf-8')
+        path.with_suffix('.json').write_text('{}')
+        
+        result = generate_all_job_metadata(skip_existing=True, pages=index_downloaded_pages())
+        
+        self.assertEqual(result, (0, 1, 0))
+        self.assertEqual(path.with_suffix('.json').read_text(), '{}')
+    
+    def test_closed_job_has_no_content(self):
+        """Test that closed postings are marked closed without extracting content."""
+        path = Path(get_job_page_path(123456))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('<html><body><main>На жаль, вакансія вже закрита!</main></body></html>',
+                        encoding='utf-8')
+        
+        self.assertEqual(generate_all_job_metadata(), (1, 0, 0))
+        metadata = json.loads(path.with_suffix('.json').read_text(encoding='utf-8'))
+        self.assertEqual(metadata['status'], 'closed')
+        self.assertEqual(metadata['content'], '')
+    
+    def test_write_metadata_keeps_unicode(self):
+        """Test that metadata is written as readable UTF-8 JSON."""
+        write_metadata('job_1.json', {'post_id': 1, 'position': 'Аналітик'})
+        
+        text = Path('job_1.json').read_text(encoding='utf-8')
+        self.assertIn('Аналітик', text)
+        self.assertEqual(json.loads(text), {'post_id': 1, 'position': 'Аналітик'})
+
+
+class TestLogCronStats(TempDirTestCase):
+    """Test log_cron_stats function."""
     
     def test_stats_file_creation(self):
         """Test that stats file is created."""
@@ -242,20 +396,9 @@ class TestLogCronStats(unittest.TestCase):
         self.assertEqual(len(lines), 2)
 
 
-class TestIntegration(unittest.TestCase):
+class TestIntegration(TempDirTestCase):
     """Integration tests for script components."""
     
-    def setUp(self):
-        """Create temporary directory for tests."""
-        self.temp_dir = tempfile.TemporaryDirectory()
-        self.original_cwd = os.getcwd()
-        os.chdir(self.temp_dir.name)
-    
-    def tearDown(self):
-        """Clean up temporary directory."""
-        os.chdir(self.original_cwd)
-        self.temp_dir.cleanup()
-    
     def test_download_check_flow(self):
         """Test the download checking flow."""
         post_id = 555555
@@ -264,7 +407,7 @@ class TestIntegration(unittest.TestCase):
         self.assertFalse(is_already_downloaded(post_id))
         
         # Create a valid job file
-        path = get_job_page_path(post_id)
+        path = Path(get_job_page_path(post_id))
         path.parent.mkdir(parents=True, exist_ok=True)
         html_content = '<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>Job</body></html>'
         with open(path, 'w', encoding='utf-8') as f:
@@ -19,7 +19,8 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
 
 from parse_html_to_json import (
-    extract_post_id
+    extract_post_id,
+    parse_html_file
 )
 
 
@@ -48,12 +49,50 @@ class TestExtractPostId(unittest.TestCase):
         post_id = extract_post_id('invalid')
         self.assertIsNone(post_id)
     
+    def test_non_digit_suffix(self):
+        """Test that an empty or non-digit suffix is rejected."""
+        self.assertIsNone(extract_post_id('post-'))
+        self.assertIsNone(extract_post_id('post-12a'))
+        self.assertIsNone(extract_post_id('post-١٢'))
+    
     def test_none_input_raises_error(self):
         """Test with None input - should raise TypeError."""
         with self.assertRaises(TypeError):
             extract_post_id(None)
 
 
+class TestParseHtmlFile(unittest.TestCase):
+    """Test parse_html_file function."""
+    
+    def test_extracts_post_fields(self):
+        """Test that post divs are found and their fields extracted."""
+        html = (
+            '<html><body>'
+            '<div id="post-123456" class="post category-it units-abc tors-status-is-open">'
+            '<a class="job-item" href="https://example.com/vac/1">'
+            '<img class="wp-post-image" src="/img/1.png">'
+            '<h4 class="square-content__title"> Бригада </h4>'
+            '<h4 class="vacancy_content">Водій</h4></a></div>'
+            '<div id="post-abc"></div>'
+            '</body></html>'
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            html_path = Path(temp_dir) / 'output_test.html'
+            html_path.write_text(html, encoding='utf-8')
+            posts = parse_html_file(html_path)
+        
+        self.assertEqual(posts, [{
+            'post_id': '123456',
+            'url': 'https://example.com/vac/1',
+            'unit_name': 'Бригада',
+            'position': 'Водій',
+            'image_url': '/img/1.png',
+            'categories': ['category-it'],
+            'units': ['units-abc'],
+            'status': 'open'
+        }])
+
+
 class TestIntegration(unittest.TestCase):
     """Integration tests for HTML parsing."""
     
@@ -14,11 +14,26 @@ Usage:
 """
 
 import json
+import re
 import sys
+from collections import deque
 from pathlib import Path
 from datetime import datetime, timedelta
 from statistics import mean, median
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Per-line JSON decoder for the stats file
+_json_loads = orjson.loads if HAS_ORJSON else json.loads
+
+
+# Pulls the ISO timestamp out of a raw JSONL line without parsing the record
+_TIMESTAMP_RE = re.compile(r'"timestamp"\s*:\s*"([^"]+)"')
+
 
 def read_stats(limit=None, days=None):
     """Read stats from JSONL file with optional filtering."""
@@ -28,27 +43,25 @@ def read_stats(limit=None, days=None):
         print(f"Stats file not found: {stats_file}")
         return []
     
-    stats = []
-    cutoff_date = None
+    # With a limit only the newest records are kept while streaming
+    stats = deque(maxlen=limit) if limit else []
+    cutoff = None
     
     if days:
-        cutoff_date = datetime.now() - timedelta(days=days)
+        # ISO-8601 timestamps compare correctly as strings
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
     
     with open(stats_file, "r", encoding="utf-8") as f:
         for line in f:
             if line.strip():
-                stat = json.loads(line)
-                stat_dt = datetime.fromisoformat(stat["timestamp"])
-                
-                if cutoff_date and stat_dt < cutoff_date:
-                    continue
+                if cutoff:
+                    match = _TIMESTAMP_RE.search(line)
+                    if match and match.group(1) < cutoff:
+                        continue
                 
-                stats.append(stat)
-    
-    if limit:
-        stats = stats[-limit:]
+                stats.append(_json_loads(line))
     
-    return stats
+    return list(stats)
 
 
 def print_table(stats):
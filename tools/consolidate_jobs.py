@@ -9,66 +9,264 @@ Usage:
     python3 tools/consolidate_jobs.py              # Generate consolidated file
     python3 tools/consolidate_jobs.py --force      # Overwrite existing
     python3 tools/consolidate_jobs.py --stats      # Show statistics
+    python3 tools/consolidate_jobs.py --dedup-stats  # Recount duplicates (reads every output file)
 """
 
+import hashlib
+import heapq
 import json
+import mmap
+import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
+from operator import itemgetter
+
+# Shared helpers live in scripts/, next to the pipeline stages
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+from fs_walk import iter_files
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+# Decoder for the per-run output files; both accept bytes
+_json_loads = orjson.loads if HAS_ORJSON else json.loads
+
+# Files to read before decoding is worth a process pool
+DECODE_POOL_MIN = 64
+
+# Below this size a plain read() is cheaper than setting up a mapping
+MMAP_MIN_BYTES = 4096
+
+# Posts encoded and written together in generate_consolidated_file
+WRITE_BATCH = 1000
+
+# Header fields written ahead of the posts array in the consolidated file
+_GENERATED_AT_RE = re.compile(rb'"generated_at"\s*:\s*"([^"]*)"')
+_TOTAL_JOBS_RE = re.compile(rb'"total_unique_jobs"\s*:\s*(\d+)')
+_HEADER_BYTES = 4096
+
+# Fields that describe the vacancy itself; post_id, url and status change
+# when the same job is posted again
+_CONTENT_FIELDS = ('unit_name', 'position', 'categories', 'units')
+
+
+def _read_posts(json_file):
+    """Decode one output file; returns (posts, error message or None)."""
+    try:
+        with open(json_file, 'rb') as f:
+            # orjson decodes straight from the mapped pages, skipping the
+            # read() copy; the stdlib decoder needs real bytes
+            if HAS_ORJSON and os.fstat(f.fileno()).st_size >= MMAP_MIN_BYTES:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    data = orjson.loads(view)
+            else:
+                data = _json_loads(f.read())
+        return data.get('posts', []), None
+    except Exception as e:
+        return [], str(e)
+
+
+def _read_post_ids(json_file):
+    """Like _read_posts, but only the post ids are kept and sent back."""
+    posts, error = _read_posts(json_file)
+    return [post.get('post_id') for post in posts], error
+
+
+def _map_files(worker, json_files):
+    """Run worker over json_files in order, in a process pool for large sets."""
+    if len(json_files) >= DECODE_POOL_MIN:
+        with ProcessPoolExecutor() as executor:
+            return list(executor.map(worker, json_files, chunksize=8))
+    return [worker(json_file) for json_file in json_files]
+
+
+def find_parsed_files():
+    """Return all output_*.json files under data/, sorted by path."""
+    json_files = sorted(map(Path, iter_files('data', 'output_', '.json')))
+    
+    if not json_files:
+        print("No JSON files found in data/")
+    else:
+        print(f"📖 Reading {len(json_files)} JSON files...")
+    
+    return json_files
+
+
+def count_parsed_jobs():
+    """Count mentions per post_id without keeping the posts themselves."""
+    source_count = defaultdict(int)
+    json_files = find_parsed_files()
+    
+    for json_file, (post_ids, error) in zip(json_files, _map_files(_read_post_ids, json_files)):
+        if error:
+            print(f"⚠️  Error reading {json_file}: {error}")
+            continue
+        for post_id in post_ids:
+            if post_id:
+                source_count[post_id] += 1
+    
+    return source_count
 
 
 def read_all_parsed_jobs():
-    """Read all jobs from output_*.json files."""
-    all_jobs = []
+    """
+    Read all jobs from output_*.json files.
+    
+    Returns (unique_by_id, source_count): post_id -> first copy of the post,
+    in order of first appearance, and post_id -> number of mentions.
+    """
     unique_by_id = {}
     source_count = defaultdict(int)
     
-    # Find all JSON files
-    data_path = Path('data')
-    json_files = sorted(data_path.rglob('output_*.json'))
-    
+    json_files = find_parsed_files()
     if not json_files:
-        print("No JSON files found in data/")
-        return [], {}
+        return {}, {}
     
-    print(f"📖 Reading {len(json_files)} JSON files...")
+    # Decoding runs in worker processes; merging stays here so the first
+    # appearance of each post still wins in file order
+    results = _map_files(_read_posts, json_files)
     
-    for json_file in json_files:
+    for json_file, (posts, error) in zip(json_files, results):
+        if error:
+            print(f"⚠️  Error reading {json_file}: {error}")
+            continue
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                posts = data.get('posts', [])
-                
-                for post in posts:
-                    post_id = post.get('post_id')
-                    if post_id and post_id not in unique_by_id:
-                        unique_by_id[post_id] = post
-                        all_jobs.append(post)
-                        source_count[post_id] = 1
-                    elif post_id:
-                        source_count[post_id] += 1
-                        
+            for post in posts:
+                post_id = post.get('post_id')
+                if post_id:
+                    # Dicts keep insertion order, so the first copy stays first
+                    unique_by_id.setdefault(post_id, post)
+                    source_count[post_id] += 1
+                    
         except Exception as e:
             print(f"⚠️  Error reading {json_file}: {e}")
     
-    return all_jobs, source_count
+    return unique_by_id, source_count
+
+
+def read_consolidated_header(path):
+    """
+    Return (total_unique_jobs, generated_at) from the consolidated file.
+    
+    Both fields are written before the posts array, so only the start of
+    the file is read; the whole file is decoded only if they are missing.
+    """
+    with open(path, 'rb') as f:
+        head = f.read(_HEADER_BYTES)
+    total = _TOTAL_JOBS_RE.search(head)
+    generated = _GENERATED_AT_RE.search(head)
+    if total and generated:
+        return int(total.group(1)), generated.group(1).decode('utf-8')
+    
+    with open(path, 'rb') as f:
+        data = _json_loads(f.read())
+    return data.get('total_unique_jobs', 0), data.get('generated_at', 'unknown')
+
+
+def content_fingerprint(post):
+    """64-bit hash of a post's _CONTENT_FIELDS, xxh3 when available."""
+    fields = [post.get(key) for key in _CONTENT_FIELDS]
+    if HAS_ORJSON:
+        encoded = orjson.dumps(fields)
+    else:
+        encoded = json.dumps(fields, ensure_ascii=False).encode('utf-8')
+    if HAS_XXHASH:
+        return xxhash.xxh3_64_intdigest(encoded)
+    return int.from_bytes(hashlib.blake2b(encoded, digest_size=8).digest(), 'little')
+
+
+def count_reposts(jobs):
+    """
+    Count jobs whose content matches an earlier job under another post_id.
+    
+    These stay in the consolidated file: every post_id has its own job
+    page and metadata, so the count is reported rather than deduplicated.
+    Jobs are bucketed by position and unit name lengths first, and only
+    a job landing in an occupied bucket gets hashed.
+    """
+    first_by_length = {}
+    fingerprints = defaultdict(set)
+    reposts = 0
+    for post in jobs:
+        length_key = (len(post.get('position') or ''), len(post.get('unit_name') or ''))
+        first = first_by_length.setdefault(length_key, post)
+        if first is post:
+            continue
+        seen = fingerprints[length_key]
+        if not seen:
+            seen.add(content_fingerprint(first))
+        fingerprint = content_fingerprint(post)
+        if fingerprint in seen:
+            reposts += 1
+        else:
+            seen.add(fingerprint)
+    return reposts
+
+
+def print_dedup_stats(source_count):
+    """Print mention, unique and duplicate counts from source_count."""
+    total_sources = sum(source_count.values())
+    if not total_sources:
+        return
+    duplicates = total_sources - len(source_count)
+    print(f"\nStatistics:")
+    print(f"  Total job mentions: {total_sources:,}")
+    print(f"  Unique jobs: {len(source_count):,}")
+    print(f"  Duplicates removed: {duplicates:,}")
+    print(f"  Dedup ratio: {100 * duplicates / total_sources:.1f}%")
+
+
+def _dumps_indented(obj, prefix):
+    """Encode obj as 2-space indented UTF-8 JSON with every line starting at prefix."""
+    if HAS_ORJSON:
+        encoded = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    else:
+        encoded = json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    # JSON strings never hold a raw newline, so every b'\n' is a line break
+    return prefix + encoded.replace(b'\n', b'\n' + prefix)
 
 
 def generate_consolidated_file(jobs):
-    """Generate consolidated JSON file."""
-    consolidated = {
-        "generated_at": datetime.now().isoformat(),
-        "total_unique_jobs": len(jobs),
-        "posts": jobs
-    }
+    """
+    Generate consolidated JSON file.
     
+    Posts are encoded and written WRITE_BATCH at a time, so memory stays
+    bounded by one batch rather than the whole file, and each batch goes
+    out as one write. The bytes match json.dump(..., ensure_ascii=False,
+    indent=2) of the same object.
+    """
     output_file = Path('data/consolidated_unique.json')
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(consolidated, f, ensure_ascii=False, indent=2)
+    with open(output_file, 'wb') as f:
+        size = f.write(b'{\n  "generated_at": ')
+        size += f.write(_dumps_indented(datetime.now().isoformat(), b''))
+        size += f.write(f',\n  "total_unique_jobs": {len(jobs)},\n  "posts": '.encode())
+        if not jobs:
+            size += f.write(b'[]\n}')
+        else:
+            size += f.write(b'[\n')
+            for start in range(0, len(jobs), WRITE_BATCH):
+                if start:
+                    size += f.write(b',\n')
+                batch = jobs[start:start + WRITE_BATCH]
+                size += f.write(b',\n'.join(_dumps_indented(post, b'    ') for post in batch))
+            size += f.write(b'\n  ]\n}')
     
-    file_size_mb = output_file.stat().st_size / (1024 * 1024)
+    # Size comes from the bytes written, so no stat of the new file
+    file_size_mb = size / (1024 * 1024)
     print(f"✓ Consolidated file created: {output_file}")
     print(f"  - Size: {file_size_mb:.2f} MB")
     print(f"  - Jobs: {len(jobs):,}")
@@ -80,6 +278,7 @@ def main():
     """Main entry point."""
     force = "--force" in sys.argv
     show_stats = "--stats" in sys.argv
+    show_dedup_stats = "--dedup-stats" in sys.argv
     
     consolidated_file = Path('data/consolidated_unique.json')
     
@@ -89,16 +288,20 @@ def main():
         print("Use --force to overwrite")
         
         if show_stats:
-            with open(consolidated_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                print(f"\nStats:")
-                print(f"  Total jobs: {data.get('total_unique_jobs', 0):,}")
-                print(f"  Generated: {data.get('generated_at', 'unknown')}")
+            total_jobs, generated_at = read_consolidated_header(consolidated_file)
+            print(f"\nStats:")
+            print(f"  Total jobs: {total_jobs:,}")
+            print(f"  Generated: {generated_at}")
+        
+        if show_dedup_stats:
+            # Decodes every output file; mention counts need only the post ids
+            print_dedup_stats(count_parsed_jobs())
         
         return
     
     # Read all jobs
-    jobs, source_count = read_all_parsed_jobs()
+    unique_by_id, source_count = read_all_parsed_jobs()
+    jobs = list(unique_by_id.values())
     
     if not jobs:
         print("No jobs found to consolidate")
@@ -106,26 +309,20 @@ def main():
     
     # Show statistics
     if show_stats:
-        total_sources = sum(source_count.values())
-        duplicates = total_sources - len(jobs)
-        print(f"\nStatistics:")
-        print(f"  Total job mentions: {total_sources:,}")
-        print(f"  Unique jobs: {len(jobs):,}")
-        print(f"  Duplicates removed: {duplicates:,}")
-        print(f"  Dedup ratio: {100 * duplicates / total_sources:.1f}%")
+        print_dedup_stats(source_count)
+        print(f"  Re-posted under a new ID: {count_reposts(jobs):,}")
     
     # Generate file
     generate_consolidated_file(jobs)
     
     if show_stats:
         # Find most duplicated jobs
-        top_dup = sorted([(id, count) for id, count in source_count.items()], 
-                        key=lambda x: x[1], reverse=True)[:5]
+        top_dup = heapq.nlargest(5, source_count.items(), key=itemgetter(1))
         
         if top_dup and top_dup[0][1] > 1:
             print(f"\nMost duplicated jobs:")
             for job_id, count in top_dup:
-                job = next((j for j in jobs if j.get('post_id') == job_id), {})
+                job = unique_by_id.get(job_id, {})
                 position = job.get('position', 'Unknown')[:50]
                 print(f"  - {job_id}: {position} (found {count} times)")
 
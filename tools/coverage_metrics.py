@@ -49,25 +49,27 @@ def get_coverage_stats(cov):
     # Get total coverage percentage
     total_coverage = cov.report(skip_covered=False, skip_empty=True, precision=2)
     
-    # Get per-file stats
+    # Get per-file stats; files removed since the run have no source to analyze
     file_stats = {}
-    for filename in cov.get_data().measured_files():
+    measured = [f for f in cov.get_data().measured_files() if os.path.isfile(f)]
+    for filename in measured:
         try:
-            analysis = cov._analyze(filename)
-            statements = len(analysis.statements)
-            missing = len(analysis.missing)
-            executed = statements - missing
-            
-            if statements > 0:
-                percentage = (executed / statements) * 100
-                file_stats[filename] = {
-                    'statements': statements,
-                    'executed': executed,
-                    'missing': missing,
-                    'coverage': round(percentage, 2)
-                }
-        except Exception as e:
-            pass
+            _, statements, _, missing, _ = cov.analysis2(filename)
+        except coverage.CoverageException:
+            continue
+        
+        statements = len(statements)
+        missing = len(missing)
+        executed = statements - missing
+        
+        if statements > 0:
+            percentage = (executed / statements) * 100
+            file_stats[filename] = {
+                'statements': statements,
+                'executed': executed,
+                'missing': missing,
+                'coverage': round(percentage, 2)
+            }
     
     return {
         'total': total_coverage,
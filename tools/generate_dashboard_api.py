@@ -6,8 +6,19 @@ Run this after the scraper/parser completes.
 
 import os
 import json
+import sys
 from pathlib import Path
 
+# Shared helpers live in scripts/, next to the pipeline stages
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+from fs_walk import iter_files
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 
 def generate_json_file_list(base_dir='data', output_dir='api'):
     """Generate a list of all JSON files in data directory."""
@@ -18,20 +29,23 @@ def generate_json_file_list(base_dir='data', output_dir='api'):
         print(f"Directory {base_dir} does not exist")
         return
     
-    # Find all JSON files
-    json_files = list(base_path.rglob('*.json'))
+    # Find all JSON files, except consolidated_unique.json
+    json_files = [path for path in iter_files(str(base_path), suffix='.json')
+                  if os.path.basename(path) != 'consolidated_unique.json']
     
-    # Filter out consolidated_unique.json
-    json_files = [f for f in json_files if f.name != 'consolidated_unique.json']
+    # Newest first; splitting into components sorts exactly like Path objects
+    json_files.sort(key=lambda path: path.split(os.sep), reverse=True)
     
-    # Convert to relative paths and create objects with path property
+    # Convert to relative paths and create objects with path property,
+    # using string operations rather than a Path per file
+    prefix_len = len(str(base_path.parent).rstrip(os.sep)) + 1
     file_objects = []
-    for json_file in sorted(json_files, reverse=True):
-        relative_path = str(json_file.relative_to(base_path.parent))
+    for json_file in json_files:
+        directory, name = os.path.split(json_file)
         file_objects.append({
-            'path': relative_path,
-            'name': json_file.stem,
-            'date': str(json_file.parent)
+            'path': json_file[prefix_len:],
+            'name': os.path.splitext(name)[0],
+            'date': directory
         })
     
     # Create output directory
@@ -45,8 +59,12 @@ def generate_json_file_list(base_dir='data', output_dir='api'):
     }
     
     output_file = output_path / 'list-json-files.json'
-    with open(output_file, 'w') as f:
-        json.dump(file_list, f, indent=2)
+    if HAS_ORJSON:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(file_list, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_file, 'w') as f:
+            json.dump(file_list, f, indent=2)
     
     print(f"✓ Generated file list with {len(file_objects)} files")
     print(f"✓ Saved to {output_file}")
@@ -6,7 +6,7 @@ Generate an HTML report showing job tracking statistics with charts and graphs.
 import json
 from pathlib import Path
 from datetime import datetime
-from collections import defaultdict
+from collections import Counter, defaultdict
 
 
 def parse_date_from_path(file_path):
@@ -21,7 +21,14 @@ def parse_date_from_path(file_path):
 def generate_html_report():
     """Generate comprehensive HTML tracking report."""
     
-    job_timeline = defaultdict(list)
+    # Column-wise per-post data (keyed by post_id) instead of a list of
+    # occurrence dicts per post; per-date counts are tallied while loading
+    appearances = Counter()
+    first_seen = {}   # post_id -> (position, unit) of its first occurrence
+    last_status = {}  # post_id -> status of its latest occurrence
+    jobs_by_date = defaultdict(int)
+    open_by_date = defaultdict(int)
+    closed_by_date = defaultdict(int)
     all_dates = set()
     
     saved_json_dir = Path('saved_json')
@@ -39,36 +46,30 @@ def generate_html_report():
                 for post in data.get('posts', []):
                     post_id = post.get('post_id')
                     if post_id:
-                        job_timeline[post_id].append({
-                            'date': date,
-                            'status': post.get('status', 'unknown'),
-                            'position': post.get('position', 'N/A'),
-                            'unit': post.get('unit_name', 'N/A')
-                        })
+                        status = post.get('status', 'unknown')
+                        appearances[post_id] += 1
+                        if post_id not in first_seen:
+                            first_seen[post_id] = (post.get('position', 'N/A'), post.get('unit_name', 'N/A'))
+                        last_status[post_id] = status
+                        
+                        jobs_by_date[date] += 1
+                        if status == 'open':
+                            open_by_date[date] += 1
+                        elif status == 'closed':
+                            closed_by_date[date] += 1
         except Exception as e:
             pass
     
     # Calculate statistics
     all_dates = sorted(list(all_dates))
-    jobs_by_date = defaultdict(int)
-    open_by_date = defaultdict(int)
-    closed_by_date = defaultdict(int)
-    
-    for post_id, occurrences in job_timeline.items():
-        for occ in occurrences:
-            jobs_by_date[occ['date']] += 1
-            if occ['status'] == 'open':
-                open_by_date[occ['date']] += 1
-            elif occ['status'] == 'closed':
-                closed_by_date[occ['date']] += 1
     
     # Jobs appearing in all scrapes
-    jobs_all_scrapes = sum(1 for v in job_timeline.values() if len(v) == len(json_files))
-    jobs_once = sum(1 for v in job_timeline.values() if len(v) == 1)
-    jobs_closed = sum(1 for v in job_timeline.values() if v[-1]['status'] == 'closed')
+    jobs_all_scrapes = sum(1 for n in appearances.values() if n == len(json_files))
+    jobs_once = sum(1 for n in appearances.values() if n == 1)
+    jobs_closed = sum(1 for status in last_status.values() if status == 'closed')
     
-    # Top 20 persistent jobs
-    top_jobs = sorted(job_timeline.items(), key=lambda x: len(x[1]), reverse=True)[:20]
+    # Top 20 persistent jobs (ties keep first-seen order, like a stable sort)
+    top_jobs = appearances.most_common(20)
     
     # Generate HTML
     html = f"""<!DOCTYPE html>
@@ -159,7 +160,7 @@ def generate_html_report():
         <div class="row mb-4">
             <div class="col-md-3">
                 <div class="stat-box">
-                    <div class="stat-number">{len(job_timeline)}</div>
+                    <div class="stat-number">{len(appearances)}</div>
                     <div class="stat-label">Unique Jobs</div>
                 </div>
             </div>
@@ -217,17 +218,15 @@ def generate_html_report():
 """
     
     # Add top jobs
-    for idx, (post_id, occurrences) in enumerate(top_jobs, 1):
-        position = occurrences[0]['position']
-        unit = occurrences[0]['unit']
-        appearances = len(occurrences)
+    for idx, (post_id, count) in enumerate(top_jobs, 1):
+        position, unit = first_seen[post_id]
         
         html += f"""                            <div class="job-row">
                                 <div>
                                     <div class="job-position">{idx}. {position}</div>
                                     <small class="text-muted">{unit}</small>
                                 </div>
-                                <div class="job-appearances">{appearances} scrapes</div>
+                                <div class="job-appearances">{count} scrapes</div>
                             </div>
 """
     
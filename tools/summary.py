@@ -14,14 +14,55 @@ Usage:
 """
 
 import json
+import os
 import sys
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-def read_stats_file():
-    """Read all stats from JSONL file."""
+# Decoder for stats lines and job metadata; both accept bytes
+_json_loads = orjson.loads if HAS_ORJSON else json.loads
+
+
+def _tail_lines(path, limit, block_size=65536):
+    """
+    Return the last `limit` non-blank lines of path as bytes.
+    
+    Reads fixed-size blocks backwards from the end of the file, stopping
+    once enough lines have been seen, so the cost does not grow with the
+    length of the history.
+    """
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        data = b""
+        pos = end
+        while pos > 0:
+            pos = max(0, pos - block_size)
+            f.seek(pos)
+            data = f.read(end - pos)
+            lines = data.split(b"\n")
+            # The first piece may be a partial line unless we reached the start
+            complete = lines if pos == 0 else lines[1:]
+            kept = [line for line in complete if line.strip()]
+            if len(kept) >= limit:
+                return kept[-limit:]
+        return [line for line in data.split(b"\n") if line.strip()][-limit:]
+
+
+def read_stats_file(limit=10):
+    """
+    Read the last `limit` stats from JSONL file.
+    
+    Only the tail of the file is read and decoded; older history is never
+    touched. A malformed line among them is dropped, leaving fewer than
+    `limit`.
+    """
     stats_file = Path("logs/cron_stats.jsonl")
     
     if not stats_file.exists():
@@ -29,44 +70,76 @@ def read_stats_file():
     
     stats = []
     try:
-        with open(stats_file, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    try:
-                        stat = json.loads(line)
-                        stats.append(stat)
-                    except json.JSONDecodeError:
-                        pass
+        for line in _tail_lines(stats_file, limit):
+            try:
+                stats.append(_json_loads(line))
+            except ValueError:
+                pass
     except Exception:
         pass
     
     return stats
 
 
-def count_files():
-    """Count all files in the system."""
+JOB_PAGES_DIR = os.path.join('data', 'job-pages')
+
+
+def scan_data_tree(root='data'):
+    """
+    Walk data/ once and collect everything the summary needs.
+    
+    Returns (counts, latest): counts has the same keys as before, and
+    latest maps 'output_html', 'output_json', 'job_html' and 'job_json' to
+    (mtime, path) of the newest such file, or None. job_* files count
+    only under data/job-pages. Job page HTML is stat-ed only when stage 3's
+    .last_run sentinel is missing, since get_last_timestamps uses the
+    sentinel instead.
+    """
     counts = {
         "json_files": 0,
         "job_pages_html": 0,
         "job_pages_json": 0,
     }
-    
-    # Count JSON files
-    data_path = Path('data')
-    if data_path.exists():
-        counts['json_files'] = len(list(data_path.rglob('output_*.json')))
-    
-    # Count job page files
-    job_pages_path = Path('data/job-pages')
-    if job_pages_path.exists():
-        counts['job_pages_html'] = len(list(job_pages_path.rglob('job_*.html')))
-        counts['job_pages_json'] = len(list(job_pages_path.rglob('job_*.json')))
-    
-    return counts
+    latest = dict.fromkeys(('output_html', 'output_json', 'job_html', 'job_json'))
+    stat_job_html = not os.path.exists(os.path.join(JOB_PAGES_DIR, '.last_run'))
+    
+    def track(kind, entry):
+        mtime = entry.stat().st_mtime
+        current = latest[kind]
+        if current is None or mtime > current[0]:
+            latest[kind] = (mtime, entry.path)
+    
+    stack = [(root, root == JOB_PAGES_DIR)]
+    while stack:
+        directory, in_job_pages = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, in_job_pages or entry.path == JOB_PAGES_DIR))
+                    elif name.startswith('output_'):
+                        if name.endswith('.json'):
+                            counts['json_files'] += 1
+                            track('output_json', entry)
+                        elif name.endswith('.html'):
+                            track('output_html', entry)
+                    elif in_job_pages and name.startswith('job_'):
+                        if name.endswith('.html'):
+                            counts['job_pages_html'] += 1
+                            if stat_job_html:
+                                track('job_html', entry)
+                        elif name.endswith('.json'):
+                            counts['job_pages_json'] += 1
+                            track('job_json', entry)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    
+    return counts, latest
 
 
-def get_last_timestamps():
-    """Get last modified timestamps for key components."""
+def get_last_timestamps(latest):
+    """Get last modified timestamps for key components from scan_data_tree()."""
     timestamps = {
         "last_html_main": None,
         "last_json_parsed": None,
@@ -74,50 +147,37 @@ def get_last_timestamps():
     }
     
     # Latest main page HTML
-    data_path = Path('data')
-    if data_path.exists():
-        html_files = list(data_path.rglob('output_*.html'))
-        if html_files:
-            latest = max(html_files, key=lambda f: f.stat().st_mtime)
-            timestamps['last_html_main'] = datetime.fromtimestamp(latest.stat().st_mtime)
-        
-        # Latest parsed JSON
-        json_files = list(data_path.rglob('output_*.json'))
-        if json_files:
-            latest = max(json_files, key=lambda f: f.stat().st_mtime)
-            timestamps['last_json_parsed'] = datetime.fromtimestamp(latest.stat().st_mtime)
-    
-    # Latest job page
-    job_pages_path = Path('data/job-pages')
-    if job_pages_path.exists():
-        job_files = list(job_pages_path.rglob('job_*.html'))
-        if job_files:
-            latest = max(job_files, key=lambda f: f.stat().st_mtime)
-            timestamps['last_job_page'] = datetime.fromtimestamp(latest.stat().st_mtime)
+    if latest['output_html']:
+        timestamps['last_html_main'] = datetime.fromtimestamp(latest['output_html'][0])
+    
+    # Latest parsed JSON
+    if latest['output_json']:
+        timestamps['last_json_parsed'] = datetime.fromtimestamp(latest['output_json'][0])
+    
+    # Latest job page: stage 3 touches a sentinel whenever it saves pages,
+    # so one stat replaces comparing every job page's mtime
+    sentinel = Path(JOB_PAGES_DIR) / '.last_run'
+    if sentinel.exists():
+        timestamps['last_job_page'] = datetime.fromtimestamp(sentinel.stat().st_mtime)
+    elif latest['job_html']:
+        timestamps['last_job_page'] = datetime.fromtimestamp(latest['job_html'][0])
     
     return timestamps
 
 
-def get_newest_job():
+def get_newest_job(latest):
     """Get the most recently downloaded job with its metadata."""
-    job_pages_path = Path('data/job-pages')
-    
-    if not job_pages_path.exists():
-        return None
-    
-    job_files = list(job_pages_path.rglob('job_*.json'))
-    if not job_files:
+    # The most recently modified job, found by scan_data_tree()
+    newest = latest['job_json']
+    if newest is None:
         return None
-    
-    # Get the most recently modified job
-    newest_job_file = max(job_files, key=lambda f: f.stat().st_mtime)
+    mtime, newest_job_file = newest
     
     try:
-        with open(newest_job_file, 'r', encoding='utf-8') as f:
-            job_data = json.load(f)
-            job_data['file_path'] = str(newest_job_file)
-            job_data['modified_at'] = datetime.fromtimestamp(newest_job_file.stat().st_mtime)
-            return job_data
+        job_data = _json_loads(Path(newest_job_file).read_bytes())
+        job_data['file_path'] = newest_job_file
+        job_data['modified_at'] = datetime.fromtimestamp(mtime)
+        return job_data
     except Exception:
         return None
 
@@ -272,9 +332,9 @@ def main():
     raw_mode = "--raw" in sys.argv
     
     stats = read_stats_file()
-    counts = count_files()
-    timestamps = get_last_timestamps()
-    newest_job = get_newest_job()
+    counts, latest = scan_data_tree()
+    timestamps = get_last_timestamps(latest)
+    newest_job = get_newest_job(latest)
     
     if raw_mode:
         output = {
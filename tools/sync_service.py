@@ -1,16 +1,34 @@
 """
-Data Sync Service - Syncs data folder from remote VPS using scp
+Data Sync Service - Syncs data folder from remote VPS using rsync (SFTP or scp fallback)
 """
 
 import os
 import json
+import asyncio
+import heapq
 import logging
+import shlex
+import shutil
 import subprocess
+import sys
+import tempfile
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List
 from dataclasses import dataclass
 
+# Shared helpers live in scripts/, next to the pipeline stages
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+from fs_walk import iter_files
+
+try:
+    import asyncssh
+    HAS_ASYNCSSH = True
+except ImportError:
+    HAS_ASYNCSSH = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -18,15 +36,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Entries kept when the sync log is compacted, and the size that triggers it
+SYNC_LOG_KEEP = 100
+SYNC_LOG_COMPACT_BYTES = 64 * 1024
+
 
 @dataclass
 class SyncConfig:
-    """Configuration for data sync via scp"""
+    """Configuration for data sync via rsync or scp"""
     remote_host: str = ""
     remote_user: str = ""
     remote_path: str = "/home/user/Quiet-Quail/data"
     local_path: str = "./data"
     remote_port: int = 22
+    use_rsync: bool = True
+    parallel_workers: int = 4
     
     @classmethod
     def from_file(cls, config_file: str = ".sync_config.json"):
@@ -44,7 +68,9 @@ class SyncConfig:
             'remote_user': self.remote_user,
             'remote_path': self.remote_path,
             'local_path': self.local_path,
-            'remote_port': self.remote_port
+            'remote_port': self.remote_port,
+            'use_rsync': self.use_rsync,
+            'parallel_workers': self.parallel_workers
         }
         with open(config_file, 'w') as f:
             json.dump(data, f, indent=2)
@@ -52,22 +78,52 @@ class SyncConfig:
 
 
 class DataSyncService:
-    """Handles data synchronization from remote server using scp"""
+    """Handles data synchronization from remote server using rsync or scp"""
     
     def __init__(self, config: SyncConfig):
         self.config = config
         self.local_path = Path(config.local_path).absolute()
-        self.sync_log = self.local_path / ".sync_log"
+        self.sync_log = self.local_path / ".sync_log.jsonl"
+        # Older versions kept the history as one JSON array
+        self.legacy_sync_log = self.local_path / ".sync_log"
+        # One multiplexed SSH connection per sync, shared by every transfer
+        self._ssh_control_path = os.path.join(tempfile.gettempdir(), f"qq-ssh-{os.getpid()}-%r@%h:%p")
         
     def sync(self) -> bool:
-        """Execute data sync using scp"""
-        logger.info(f"🔄 Starting data sync via scp")
+        """
+        Execute data sync using rsync, or scp when use_rsync is off.
+        
+        If rsync is wanted but not installed, SFTP (asyncssh) stands in for
+        it when available; scp is the last resort.
+        """
+        if not self.config.use_rsync:
+            method = "scp"
+        elif shutil.which("rsync") is not None:
+            method = "rsync"
+        elif HAS_ASYNCSSH:
+            method = "sftp"
+        else:
+            method = "scp"
+        logger.info(f"🔄 Starting data sync via {method}")
         
         try:
             # Create local directory if it doesn't exist
             self.local_path.mkdir(parents=True, exist_ok=True)
             
-            success = self._sync_scp()
+            if method == "sftp":
+                # asyncssh keeps its own single connection
+                success = self._sync_sftp()
+            else:
+                self._open_ssh_master()
+                try:
+                    if method == "scp":
+                        success = self._sync_scp()
+                    elif self.config.parallel_workers > 1:
+                        success = self._sync_parallel()
+                    else:
+                        success = self._sync_rsync()
+                finally:
+                    self._close_ssh_master()
             
             if success:
                 self._log_sync("SUCCESS")
@@ -88,6 +144,197 @@ class DataSyncService:
             self._log_sync(f"ERROR: {str(e)}")
             return False
     
+    def _ssh_options(self) -> List[str]:
+        """ssh options that route a connection through the shared control socket"""
+        return ["-o", f"ControlPath={self._ssh_control_path}"]
+    
+    def _open_ssh_master(self) -> None:
+        """
+        Open the shared SSH connection in the background.
+        
+        Later ssh, scp and rsync calls pass _ssh_options() and run as extra
+        channels on it, skipping key exchange and authentication and staying
+        clear of sshd's MaxStartups limit. If it cannot be opened they
+        simply connect on their own.
+        """
+        cmd = [
+            "ssh", "-M", "-N", "-f",
+            *self._ssh_options(),
+            "-o", "ControlPersist=120s",
+            "-p", str(self.config.remote_port),
+            f"{self.config.remote_user}@{self.config.remote_host}"
+        ]
+        try:
+            subprocess.run(cmd, check=True)
+        except (subprocess.CalledProcessError, FileNotFoundError) as e:
+            logger.warning(f"⚠ Could not open shared SSH connection: {e}")
+    
+    def _close_ssh_master(self) -> None:
+        """Close the shared SSH connection, if one is open"""
+        cmd = [
+            "ssh", "-O", "exit",
+            *self._ssh_options(),
+            "-p", str(self.config.remote_port),
+            f"{self.config.remote_user}@{self.config.remote_host}"
+        ]
+        try:
+            subprocess.run(cmd, capture_output=True)
+        except FileNotFoundError:
+            pass
+    
+    def _rsync_cmd(self) -> List[str]:
+        """Common rsync arguments for full and per-bucket transfers"""
+        return [
+            "rsync",
+            "-az",
+            "--partial",
+            "--inplace",
+            "-e", f"ssh -p {self.config.remote_port} -o ControlPath={shlex.quote(self._ssh_control_path)}",
+        ]
+    
+    def _sync_rsync(self) -> bool:
+        """
+        Sync using rsync.
+        
+        Unchanged files are skipped by size and mtime, and changed ones send
+        only the differing blocks. --partial keeps interrupted files so the
+        next run resumes them, and --inplace updates them without a temporary
+        copy. Local-only files are never deleted, as with scp.
+        """
+        remote_spec = f"{self.config.remote_user}@{self.config.remote_host}:{self.config.remote_path}/"
+        local_spec = str(self.local_path) + "/"
+        
+        cmd = self._rsync_cmd() + ["--info=progress2", remote_spec, local_spec]
+        
+        logger.info(f"📋 Connecting to {self.config.remote_user}@{self.config.remote_host}:{self.config.remote_path}")
+        logger.info(f"📤 Transferring changed files to {local_spec}")
+        
+        try:
+            # Run without capturing output to show real-time progress
+            subprocess.run(cmd, check=True)
+            logger.info(f"✓ Sync completed successfully")
+            return True
+        except subprocess.CalledProcessError as e:
+            logger.error(f"✗ Rsync failed with exit code {e.returncode}")
+            return False
+        except FileNotFoundError:
+            logger.error("✗ rsync not found. Install rsync or set use_rsync to false.")
+            return False
+    
+    def _list_remote_sizes(self) -> Dict[str, int]:
+        """Total bytes under each top-level entry of the remote data folder"""
+        printf_format = shlex.quote("%s %P\\n")
+        cmd = [
+            "ssh",
+            *self._ssh_options(),
+            "-p", str(self.config.remote_port),
+            f"{self.config.remote_user}@{self.config.remote_host}",
+            f"find {shlex.quote(self.config.remote_path)} -type f -printf {printf_format}"
+        ]
+        output = subprocess.run(cmd, check=True, capture_output=True, text=True, timeout=60).stdout
+        
+        sizes = defaultdict(int)
+        for line in output.splitlines():
+            size, _, relative = line.partition(" ")
+            if relative:
+                sizes[relative.split("/", 1)[0]] += int(size)
+        return sizes
+    
+    @staticmethod
+    def _partition(sizes: Dict[str, int], workers: int) -> List[List[str]]:
+        """Split entries into up to `workers` buckets of similar total size, largest first"""
+        buckets = [(0, i, []) for i in range(min(workers, len(sizes)))]
+        for name, size in sorted(sizes.items(), key=lambda item: item[1], reverse=True):
+            total, i, names = heapq.heappop(buckets)
+            names.append(name)
+            heapq.heappush(buckets, (total + size, i, names))
+        return [names for _, _, names in sorted(buckets, key=lambda bucket: bucket[1])]
+    
+    def _sync_parallel(self) -> bool:
+        """
+        Sync using several rsync processes at once.
+        
+        One ssh find lists the remote tree with file sizes; its top-level
+        entries are split into parallel_workers buckets of similar size (as
+        fpart does), and each bucket is transferred by its own rsync. The
+        workers run as channels on the shared SSH connection, so they overlap
+        per-file round trips and each side's rsync work but share one TCP
+        stream and one ssh cipher process. Falls back to a single rsync if
+        the listing fails.
+        """
+        try:
+            sizes = self._list_remote_sizes()
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError) as e:
+            logger.warning(f"⚠ Could not list remote folder ({e}), using a single rsync")
+            return self._sync_rsync()
+        
+        buckets = self._partition(sizes, self.config.parallel_workers)
+        if len(buckets) < 2:
+            return self._sync_rsync()
+        
+        remote_spec = f"{self.config.remote_user}@{self.config.remote_host}:{self.config.remote_path}/"
+        local_spec = str(self.local_path) + "/"
+        
+        logger.info(f"📋 Connecting to {self.config.remote_user}@{self.config.remote_host}:{self.config.remote_path}")
+        logger.info(f"📤 Transferring {len(sizes)} entries to {local_spec} with {len(buckets)} rsync workers")
+        
+        with tempfile.TemporaryDirectory() as list_dir:
+            commands = []
+            for i, names in enumerate(buckets):
+                list_file = os.path.join(list_dir, f"bucket-{i}.txt")
+                with open(list_file, "w") as f:
+                    f.write("\n".join(names) + "\n")
+                # --files-from turns off the recursion implied by -a
+                commands.append(self._rsync_cmd() + ["-r", f"--files-from={list_file}", remote_spec, local_spec])
+            
+            with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+                return_codes = list(executor.map(lambda cmd: subprocess.run(cmd).returncode, commands))
+        
+        failed = [code for code in return_codes if code != 0]
+        if failed:
+            logger.error(f"✗ {len(failed)} of {len(commands)} rsync workers failed (exit codes {failed})")
+            return False
+        
+        logger.info(f"✓ Sync completed successfully")
+        return True
+    
+    async def _sync_sftp_async(self) -> None:
+        """
+        Copy the remote data folder over one SFTP session.
+        
+        Each transfer keeps up to 128 block reads in flight instead of
+        waiting on one at a time, and up to parallel_workers top-level
+        entries are transferred at once.
+        """
+        async with asyncssh.connect(
+            self.config.remote_host,
+            port=self.config.remote_port,
+            username=self.config.remote_user
+        ) as conn:
+            async with conn.start_sftp_client() as sftp:
+                entries = await sftp.glob(f"{self.config.remote_path}/*")
+                limit = asyncio.Semaphore(max(1, self.config.parallel_workers))
+                
+                async def fetch(remote_entry):
+                    async with limit:
+                        await sftp.get(remote_entry, str(self.local_path), recurse=True,
+                                       preserve=True, max_requests=128, block_size=32768)
+                
+                await asyncio.gather(*(fetch(entry) for entry in entries))
+    
+    def _sync_sftp(self) -> bool:
+        """Sync using SFTP through asyncssh"""
+        logger.info(f"📋 Connecting to {self.config.remote_user}@{self.config.remote_host}:{self.config.remote_path}")
+        logger.info(f"📤 Transferring files to {self.local_path}/")
+        
+        try:
+            asyncio.run(self._sync_sftp_async())
+            logger.info(f"✓ Sync completed successfully")
+            return True
+        except (OSError, asyncssh.Error) as e:
+            logger.error(f"✗ SFTP failed: {e}")
+            return False
+    
     def _sync_scp(self) -> bool:
         """Sync using scp (secure copy)"""
         remote_spec = f"{self.config.remote_user}@{self.config.remote_host}:{self.config.remote_path}/"
@@ -96,6 +343,7 @@ class DataSyncService:
         cmd = [
             "scp",
             "-r",
+            *self._ssh_options(),
             "-P", str(self.config.remote_port),
             "-v",  # Verbose for progress
             remote_spec,
@@ -142,31 +390,46 @@ class DataSyncService:
         except Exception as e:
             logger.warning(f"⚠ Consolidation error: {e}")
     
+    def _migrate_legacy_log(self) -> None:
+        """Convert the legacy JSON-array sync log to JSON lines, once"""
+        if not self.sync_log.exists() and self.legacy_sync_log.exists():
+            with open(self.legacy_sync_log) as f:
+                legacy = json.load(f)
+            with open(self.sync_log, 'w') as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in legacy[-SYNC_LOG_KEEP:])
+    
     def _log_sync(self, status: str):
-        """Log sync operation"""
+        """
+        Append one JSON line to the sync log.
+        
+        Once the file passes SYNC_LOG_COMPACT_BYTES it is rewritten with
+        only the last SYNC_LOG_KEEP entries, so most syncs cost one append.
+        """
         try:
             log_entry = {
                 "timestamp": datetime.now().isoformat(),
                 "status": status,
-                "files_synced": len(list(self.local_path.rglob("*"))) if self.local_path.exists() else 0
+                "files_synced": sum(1 for _ in iter_files(str(self.local_path)))
             }
             
-            logs = []
-            if self.sync_log.exists():
-                with open(self.sync_log) as f:
-                    logs = json.load(f)
+            self._migrate_legacy_log()
             
-            logs.append(log_entry)
-            logs = logs[-100:]
+            with open(self.sync_log, 'a') as f:
+                f.write(json.dumps(log_entry) + "\n")
+                size = f.tell()
             
-            with open(self.sync_log, 'w') as f:
-                json.dump(logs, f, indent=2)
+            if size > SYNC_LOG_COMPACT_BYTES:
+                with open(self.sync_log) as f:
+                    lines = deque(f, maxlen=SYNC_LOG_KEEP)
+                with open(self.sync_log, 'w') as f:
+                    f.writelines(lines)
         except Exception as e:
             logger.warning(f"Could not write sync log: {e}")
     
     def get_sync_status(self) -> Dict:
-        """Get current sync status and history"""
+        """Get current sync status and history from the tail of the sync log"""
         try:
+            self._migrate_legacy_log()
             if not self.sync_log.exists():
                 return {
                     "status": "never",
@@ -175,13 +438,13 @@ class DataSyncService:
                 }
             
             with open(self.sync_log) as f:
-                logs = json.load(f)
+                logs = [json.loads(line) for line in deque(f, maxlen=10) if line.strip()]
             
             return {
                 "status": logs[-1]['status'] if logs else None,
                 "last_sync": logs[-1]['timestamp'] if logs else None,
                 "file_count": logs[-1].get('files_synced', 0) if logs else 0,
-                "history": logs[-10:]
+                "history": logs
             }
         except Exception as e:
             logger.warning(f"Could not read sync status: {e}")
@@ -234,9 +234,9 @@ class DataValidator:
             self.warnings.append(f"JSON without HTML pair: {stem}.json")
         
         # Count job_*.html files (individual job pages, don't need pairs)
-        job_pages = list(self.data_dir.rglob('job_*.html'))
+        job_pages = sum(1 for _ in self.data_dir.rglob('job_*.html'))
         if job_pages:
-            self.stats['job_pages'] = len(job_pages)
+            self.stats['job_pages'] = job_pages
 
     def print_results(self):
         """Print validation results."""
@@ -13,12 +13,17 @@ Usage:
     python3 tools/view_cron_stats.py --validate   # With file validation
 """
 
+import functools
 import json
 import sys
 import os
 from pathlib import Path
 from datetime import datetime
 
+# Shared helpers live in scripts/, next to the pipeline stages
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+from fs_walk import iter_files
+
 
 def read_stats_file():
     """Read all stats from JSONL file."""
@@ -55,36 +60,25 @@ def format_timestamp(ts_str):
         return ts_str
 
 
+# Counts are cached: --validate checks every listed run against the same tree
+
+@functools.lru_cache(maxsize=None)
 def count_json_files():
     """Count total JSON files in data directory."""
-    data_path = Path('data')
-    if not data_path.exists():
-        return 0
-    json_files = list(data_path.rglob('output_*.json'))
-    return len(json_files)
+    return sum(1 for _ in iter_files('data', 'output_', '.json'))
 
 
+@functools.lru_cache(maxsize=None)
 def count_job_pages():
     """Count downloaded job page HTML files."""
-    job_pages_path = Path('data/job-pages')
-    if not job_pages_path.exists():
-        return 0
-    job_files = list(job_pages_path.rglob('job_*.html'))
-    return len(job_files)
+    return sum(1 for _ in iter_files('data/job-pages', 'job_', '.html'))
 
 
 def get_latest_json_timestamp():
     """Get timestamp of the most recently modified JSON file."""
-    data_path = Path('data')
-    if not data_path.exists():
+    mtime = max((os.stat(path).st_mtime for path in iter_files('data', 'output_', '.json')), default=None)
+    if mtime is None:
         return None
-    
-    json_files = list(data_path.rglob('output_*.json'))
-    if not json_files:
-        return None
-    
-    latest = max(json_files, key=lambda f: f.stat().st_mtime)
-    mtime = latest.stat().st_mtime
     return datetime.fromtimestamp(mtime)
 
 
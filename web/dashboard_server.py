@@ -13,9 +13,37 @@ import re
 from pathlib import Path
 from urllib.parse import urlparse
 
+# Shared helpers live in scripts/, next to the pipeline stages
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+from fs_walk import iter_files
+
 PORT = 8000
 HOST = '127.0.0.1'
 
+# Patterns for extract_main_content, compiled once at import
+_HTML_FLAGS = re.DOTALL | re.IGNORECASE
+SCRIPT_RE = re.compile(r'<script[^>]*>.*?</script>', _HTML_FLAGS)
+STYLE_RE = re.compile(r'<style[^>]*>.*?</style>', _HTML_FLAGS)
+MAIN_CONTENT_PATTERNS = (
+    re.compile(r'<main[^>]*>(.*?)</main>', _HTML_FLAGS),
+    re.compile(r'<article[^>]*>(.*?)</article>', _HTML_FLAGS),
+    re.compile(r'<div[^>]*class="[^"]*(?:content|main|posting)[^"]*"[^>]*>(.*?)</div>', _HTML_FLAGS),
+    re.compile(r'<section[^>]*>(.*?)</section>', _HTML_FLAGS),
+)
+DIV_RE = re.compile(r'<div[^>]*>(.*?)</div>', _HTML_FLAGS)
+BODY_RE = re.compile(r'<body[^>]*>(.*?)</body>', _HTML_FLAGS)
+# Pages at least this long (chars) skip the largest-div fallback entirely
+LARGEST_DIV_SCAN_LIMIT = 512_000
+# Navigation, footer, headers, sidebars and other non-content blocks
+CHROME_PATTERNS = (
+    re.compile(r'<nav[^>]*>.*?</nav>', _HTML_FLAGS),
+    re.compile(r'<footer[^>]*>.*?</footer>', _HTML_FLAGS),
+    re.compile(r'<header[^>]*>.*?</header>', _HTML_FLAGS),
+    re.compile(r'<aside[^>]*>.*?</aside>', _HTML_FLAGS),
+    re.compile(r'<div[^>]*class="[^"]*(?:sidebar|nav|menu|ad)[^"]*"[^>]*>.*?</div>', _HTML_FLAGS),
+)
+WHITESPACE_RE = re.compile(r'\s+')
+
 
 def get_port():
     """Get port from command line argument or environment variable."""
@@ -31,6 +59,23 @@ def get_port():
     return PORT
 
 
+def find_job_file(job_pages_dir, post_id, suffix):
+    """
+    Locate job_{post_id}{suffix} under job_pages_dir, or return None.
+    
+    Checks the canonical AAA/BBB bucket path first (what stage 3 writes),
+    so a lookup is one stat; only falls back to a tree search for files
+    stored elsewhere, stopping at the first match.
+    """
+    id_str = str(post_id).zfill(6)
+    candidate = job_pages_dir / id_str[:3] / id_str[3:6] / f'job_{post_id}{suffix}'
+    if candidate.is_file():
+        return candidate
+    if not job_pages_dir.exists():
+        return None
+    return next(job_pages_dir.rglob(f'job_{post_id}{suffix}'), None)
+
+
 class DashboardHandler(http.server.SimpleHTTPRequestHandler):
     """Custom HTTP handler with CORS headers and JSON API support."""
     
@@ -211,29 +256,29 @@ class DashboardHandler(http.server.SimpleHTTPRequestHandler):
         """Serve list of job IDs that have downloaded HTML pages."""
         try:
             project_root = Path(__file__).parent.parent
-            job_pages_dir = project_root / 'data' / 'job-pages'
+            data_dir = project_root / 'data'
             downloaded_jobs = {}
             
-            # Find all downloaded job pages
-            if job_pages_dir.exists():
-                for job_file in sorted(job_pages_dir.rglob('job_*.html')):
-                    # Extract post_id from filename (job_12345.html -> 12345)
-                    try:
-                        post_id = int(job_file.stem.split('_')[1])
-                        # Check if file is valid (non-empty, contains DOCTYPE)
-                        file_size = job_file.stat().st_size
-                        if file_size > 0:
-                            with open(job_file, 'r', encoding='utf-8') as f:
-                                content = f.read(500)
-                                if '<!DOCTYPE html>' in content:
-                                    # Get relative path from data root
-                                    rel_path = job_file.relative_to(project_root / 'data')
-                                    downloaded_jobs[str(post_id)] = {
-                                        'path': f'/data/{rel_path}',
-                                        'size': file_size
-                                    }
-                    except (ValueError, OSError):
-                        continue
+            # Find all downloaded job pages (streamed, no up-front list or sort)
+            for page_path in iter_files(str(data_dir / 'job-pages'), 'job_', '.html'):
+                # Extract post_id from filename (job_12345.html -> 12345)
+                try:
+                    post_id = int(os.path.basename(page_path)[4:-5])
+                    # Check if file is valid (non-empty, contains DOCTYPE)
+                    file_size = os.stat(page_path).st_size
+                    if file_size > 0:
+                        # Check the raw head bytes; no text decoding needed
+                        with open(page_path, 'rb') as f:
+                            head = f.read(500)
+                            if b'<!DOCTYPE html>' in head:
+                                # Get relative path from data root
+                                rel_path = Path(os.path.relpath(page_path, data_dir)).as_posix()
+                                downloaded_jobs[str(post_id)] = {
+                                    'path': f'/data/{rel_path}',
+                                    'size': file_size
+                                }
+                except (ValueError, OSError):
+                    continue
             
             response = json.dumps({
                 'downloaded': downloaded_jobs,
@@ -253,50 +298,41 @@ class DashboardHandler(http.server.SimpleHTTPRequestHandler):
         """Extract main job posting content from HTML."""
         try:
             # Remove scripts and styles
-            html_content = re.sub(r'<script[^>]*>.*?</script>', '', html_content, flags=re.DOTALL | re.IGNORECASE)
-            html_content = re.sub(r'<style[^>]*>.*?</style>', '', html_content, flags=re.DOTALL | re.IGNORECASE)
+            html_content = SCRIPT_RE.sub('', html_content)
+            html_content = STYLE_RE.sub('', html_content)
             
             # Try to find main article/content area
             # Look for common patterns: main, article, .content, .job-posting, etc.
-            patterns = [
-                r'<main[^>]*>(.*?)</main>',
-                r'<article[^>]*>(.*?)</article>',
-                r'<div[^>]*class="[^"]*(?:content|main|posting)[^"]*"[^>]*>(.*?)</div>',
-                r'<section[^>]*>(.*?)</section>',
-            ]
-            
             main_content = None
-            for pattern in patterns:
-                match = re.search(pattern, html_content, flags=re.DOTALL | re.IGNORECASE)
+            for pattern in MAIN_CONTENT_PATTERNS:
+                match = pattern.search(html_content)
                 if match:
                     main_content = match.group(1)
                     break
             
-            # Fallback: find the largest div or section
-            if not main_content:
-                divs = re.findall(r'<div[^>]*>(.*?)</div>', html_content, flags=re.DOTALL | re.IGNORECASE)
-                if divs:
-                    main_content = max(divs, key=len)
+            # Fallback: find the largest div, tracking only the best span
+            # rather than collecting every div body (skipped on huge pages)
+            if not main_content and len(html_content) < LARGEST_DIV_SCAN_LIMIT:
+                best_start = best_end = 0
+                for match in DIV_RE.finditer(html_content):
+                    if match.end(1) - match.start(1) > best_end - best_start:
+                        best_start, best_end = match.span(1)
+                main_content = html_content[best_start:best_end]
             
             # If still nothing, use body content
             if not main_content:
-                body_match = re.search(r'<body[^>]*>(.*?)</body>', html_content, flags=re.DOTALL | re.IGNORECASE)
+                body_match = BODY_RE.search(html_content)
                 if body_match:
                     main_content = body_match.group(1)
                 else:
                     main_content = html_content
             
             # Clean up: remove navigation, footer, headers, sidebars
-            main_content = re.sub(r'<nav[^>]*>.*?</nav>', '', main_content, flags=re.DOTALL | re.IGNORECASE)
-            main_content = re.sub(r'<footer[^>]*>.*?</footer>', '', main_content, flags=re.DOTALL | re.IGNORECASE)
-            main_content = re.sub(r'<header[^>]*>.*?</header>', '', main_content, flags=re.DOTALL | re.IGNORECASE)
-            main_content = re.sub(r'<aside[^>]*>.*?</aside>', '', main_content, flags=re.DOTALL | re.IGNORECASE)
-            
-            # Remove common non-content elements
-            main_content = re.sub(r'<div[^>]*class="[^"]*(?:sidebar|nav|menu|ad)[^"]*"[^>]*>.*?</div>', '', main_content, flags=re.DOTALL | re.IGNORECASE)
+            for pattern in CHROME_PATTERNS:
+                main_content = pattern.sub('', main_content)
             
             # Clean up excessive whitespace
-            main_content = re.sub(r'\s+', ' ', main_content)
+            main_content = WHITESPACE_RE.sub(' ', main_content)
             main_content = main_content.strip()
             
             return main_content[:50000] if main_content else ""  # Limit to 50KB
@@ -318,22 +354,14 @@ class DashboardHandler(http.server.SimpleHTTPRequestHandler):
             job_pages_dir = project_root / 'data' / 'job-pages'
             
             # Try to find the metadata JSON file first (fast path)
-            json_file = None
-            if job_pages_dir.exists():
-                for found_file in job_pages_dir.rglob(f'job_{post_id}.json'):
-                    json_file = found_file
-                    break
+            json_file = find_job_file(job_pages_dir, post_id, '.json')
             
             # If metadata JSON doesn't exist, generate it on-demand (backward compatibility)
-            if not json_file or not json_file.exists():
+            if not json_file:
                 # Look for HTML file instead
-                html_file = None
-                if job_pages_dir.exists():
-                    for found_file in job_pages_dir.rglob(f'job_{post_id}.html'):
-                        html_file = found_file
-                        break
+                html_file = find_job_file(job_pages_dir, post_id, '.html')
                 
-                if not html_file or not html_file.exists():
+                if not html_file:
                     self.send_error(404)
                     return
                 
@@ -367,12 +395,13 @@ class DashboardHandler(http.server.SimpleHTTPRequestHandler):
         try:
             with open(html_file, 'r', encoding='utf-8') as f:
                 html_content = f.read()
+                mtime_ns = os.fstat(f.fileno()).st_mtime_ns
             
             # Check if job is closed
             is_closed = 'На жаль, вакансія вже закрита!' in html_content
             
-            # Extract main content
-            main_content = self.extract_main_content(html_content)
+            # Extract main content (a closed posting's page is boilerplate)
+            main_content = '' if is_closed else self.extract_main_content(html_content)
             
             metadata = {
                 'post_id': int(post_id),
@@ -383,7 +412,7 @@ class DashboardHandler(http.server.SimpleHTTPRequestHandler):
                 'is_closed': is_closed,
                 'content': main_content,
                 'generated': True,  # Mark as generated on-the-fly
-                'downloaded_at': str(int(html_file.stat().st_mtime))
+                'downloaded_at': str(mtime_ns // 1_000_000_000)
             }
             
             return metadata
@@ -405,16 +434,10 @@ class DashboardHandler(http.server.SimpleHTTPRequestHandler):
             
             # Try to find the job file in organized structure (ID-based)
             # Format: data/job-pages/XXX/YYY/job_XXXYYYY.html
-            job_file = None
             job_pages_dir = project_root / 'data' / 'job-pages'
+            job_file = find_job_file(job_pages_dir, post_id, '.html')
             
-            if job_pages_dir.exists():
-                # Search for the job file recursively
-                for found_file in job_pages_dir.rglob(f'job_{post_id}.html'):
-                    job_file = found_file
-                    break
-            
-            if not job_file or not job_file.exists():
+            if not job_file:
                 self.send_error(404)
                 return
             